@@ -1,18 +1,20 @@
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
 from sqlalchemy import text
-from app.db.session import SessionLocal
+from app.db.sharding import ShardedSession, get_sharded_read_session
 
 router = APIRouter()
 
 def get_db():
-    db = SessionLocal()
+    db = get_sharded_read_session()
     try:
         yield db
     finally:
         db.close()
 
 @router.get("/", tags=["Enhancements"])
-def list_businesses(db: Session = Depends(get_db)):
-    rows = db.execute(text("SELECT * FROM businesses")).mappings().all()
-    return list(rows)
+def list_businesses(db: ShardedSession = Depends(get_db)):
+    # Each business lives on exactly one shard
+    shard_rows = db.scatter(
+        lambda session: session.execute(text("SELECT * FROM businesses")).mappings().all()
+    )
+    return [row for rows in shard_rows for row in rows]
@@ -0,0 +1,117 @@
+"""
+Reports API Router
+
+Provides:
+- GET /reports/aggregates (pre-aggregated review counts + CSV)
+
+Answers from the rollup tables maintained by the ingestion pipeline, so
+the cost of a report depends on the number of groups, not on the number
+of reviews. Each shard's rollups are aggregated and the partial counts summed.
+"""
+
+from collections import defaultdict
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import func, and_
+
+from app.api.reviews import parse_date
+from app.db.sharding import ShardedSession, get_sharded_read_session
+from app.db.models import BusinessMonthRollup, CountryMonthRollup, UserMonthRollup
+from app.services.csv_export import generate_csv_response
+
+router = APIRouter()
+
+# group_by -> (rollup model, output columns)
+AGGREGATES = {
+    # Rating distribution per business per month
+    "business": (BusinessMonthRollup, ["business_id", "month", "rating"]),
+    # Review volume per country per month
+    "country": (CountryMonthRollup, ["reviewer_country", "month"]),
+    # Reviews per user
+    "user": (UserMonthRollup, ["reviewer_id"]),
+}
+
+
+# ---------------------------------------------------------------------------
+# Database session dependency
+# ---------------------------------------------------------------------------
+def get_db():
+    """Provide scoped read-only SQLAlchemy sessions (one per shard) per request."""
+    db = get_sharded_read_session()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@router.get("/aggregates", tags=["Enhancements"])
+def get_aggregates(
+    db: ShardedSession = Depends(get_db),
+    group_by: str = Query("business", pattern="^(business|country|user)$"),
+    start_date: Optional[str] = Query(None),
+    end_date: Optional[str] = Query(None),
+    min_rating: Optional[int] = Query(None, ge=1, le=5),
+    max_rating: Optional[int] = Query(None, ge=1, le=5),
+    country: Optional[str] = Query(None),
+):
+    """
+    Aggregated review counts:
+    - group_by=business: rating distribution per business per month
+    - group_by=country:  review volume per country per month
+    - group_by=user:     number of reviews per user
+
+    Accepts the same filters as GET /reviews/. Rollups are kept per
+    month, so start_date / end_date select whole months (the months that
+    contain them).
+    """
+
+    start_dt = parse_date(start_date)
+    end_dt = parse_date(end_date)
+
+    model, columns = AGGREGATES[group_by]
+    group_columns = [getattr(model, c) for c in columns]
+
+    filters = []
+
+    # Date filtering (month granularity)
+    if start_dt:
+        filters.append(model.month >= start_dt.strftime("%Y-%m"))
+    if end_dt:
+        filters.append(model.month <= end_dt.strftime("%Y-%m"))
+
+    # Rating filtering
+    if min_rating is not None:
+        filters.append(model.rating >= min_rating)
+    if max_rating is not None:
+        filters.append(model.rating <= max_rating)
+
+    # Country filtering
+    if country:
+        filters.append(func.lower(model.reviewer_country) == country.lower())
+
+    def fetch(session):
+        query = session.query(
+            *group_columns, func.sum(model.review_count).label("review_count")
+        )
+
+        if filters:
+            query = query.filter(and_(*filters))
+
+        return query.group_by(*group_columns).all()
+
+    # Country and user groups can span shards: add up the partial counts
+    totals = defaultdict(int)
+    for shard_results in db.scatter(fetch):
+        for r in shard_results:
+            totals[tuple(r)[:-1]] += r.review_count
+
+    results = [key + (count,) for key, count in sorted(totals.items())]
+
+    headers = columns + ["review_count"]
+
+    return generate_csv_response(
+        rows=results,
+        headers=headers,
+        filename=f"aggregates_{group_by}.csv",
+    )
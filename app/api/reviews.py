@@ -10,28 +10,35 @@ Provides:
    - GET /reviews/ (filtering + pagination + CSV)
 
 All endpoints return CSV files suitable for legal/compliance reporting.
+
+Business-scoped queries run on the business's shard; the others are
+scatter-gathered across shards and merged on review_date.
 """
 
 from datetime import datetime
 from typing import Optional, List
 
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
 from sqlalchemy import func, and_, cast, DateTime
 
-from app.db.session import SessionLocal
-from app.db.models import Review, User
+from app.db.sharding import ShardedSession, get_sharded_read_session, merge_by_review_date
+from app.db.models import User
+from app.db.partitions import review_date_filters, review_source
 from app.services.csv_export import generate_csv_response
 
 router = APIRouter()
 
+# Deepest page /reviews/ will serve with several shards (each shard returns
+# offset + limit rows per page); use date filters to reach older rows
+MAX_OFFSET = 10_000
+
 
 # ---------------------------------------------------------------------------
 # Database session dependency
 # ---------------------------------------------------------------------------
 def get_db():
-    """Provide a scoped SQLAlchemy session per request."""
-    db = SessionLocal()
+    """Provide scoped read-only SQLAlchemy sessions (one per shard) per request."""
+    db = get_sharded_read_session()
     try:
         yield db
     finally:
@@ -58,25 +65,29 @@ def parse_date(value: Optional[str]) -> Optional[datetime]:
 # 1. ORIGINAL TASK ENDPOINT: Get reviews for a business
 # ---------------------------------------------------------------------------
 @router.get("/business/{business_id}", tags=["Required"])
-def get_reviews_for_business(business_id: str, db: Session = Depends(get_db)):
+def get_reviews_for_business(business_id: str, db: ShardedSession = Depends(get_db)):
     """
     Retrieve all reviews for a specific business.
     Returns results as a downloadable CSV file.
     """
 
+    # All of a business's reviews live on one shard
+    shard = db.for_business(business_id)
+    source = review_source(shard.connection())
+
     reviews = (
-        db.query(
-            Review.review_id,
-            Review.reviewer_id,
-            Review.business_id,
-            Review.review_title,
-            Review.content,
-            Review.rating,
-            Review.review_date,
-            Review.review_ip_address,
+        shard.query(
+            source.c.review_id,
+            source.c.reviewer_id,
+            source.c.business_id,
+            source.c.review_title,
+            source.c.content,
+            source.c.rating,
+            source.c.review_date,
+            source.c.review_ip_address,
         )
-        .filter(Review.business_id == business_id)
-        .order_by(Review.review_date.desc())
+        .filter(source.c.business_id == business_id)
+        .order_by(source.c.review_date.desc())
         .all()
     )
 
@@ -119,27 +130,32 @@ def get_reviews_for_business(business_id: str, db: Session = Depends(get_db)):
 # 2. ORIGINAL TASK ENDPOINT: Get reviews by user
 # ---------------------------------------------------------------------------
 @router.get("/user/{reviewer_id}", tags=["Required"])
-def get_reviews_by_user(reviewer_id: str, db: Session = Depends(get_db)):
+def get_reviews_by_user(reviewer_id: str, db: ShardedSession = Depends(get_db)):
     """
     Retrieve all reviews written by a specific user.
     Returns results as a downloadable CSV file.
     """
 
-    reviews = (
-        db.query(
-            Review.review_id,
-            Review.reviewer_id,
-            Review.business_id,
-            Review.review_title,
-            Review.content,
-            Review.rating,
-            Review.review_date,
-            Review.review_ip_address,
+    def fetch(session):
+        source = review_source(session.connection())
+        return (
+            session.query(
+                source.c.review_id,
+                source.c.reviewer_id,
+                source.c.business_id,
+                source.c.review_title,
+                source.c.content,
+                source.c.rating,
+                source.c.review_date,
+                source.c.review_ip_address,
+            )
+            .filter(source.c.reviewer_id == reviewer_id)
+            .order_by(source.c.review_date.desc())
+            .all()
         )
-        .filter(Review.reviewer_id == reviewer_id)
-        .order_by(Review.review_date.desc())
-        .all()
-    )
+
+    # A user's reviews can be on any shard
+    reviews = merge_by_review_date(db.scatter(fetch))
 
     if not reviews:
         raise HTTPException(status_code=404, detail="No reviews found for this user")
@@ -181,7 +197,7 @@ def get_reviews_by_user(reviewer_id: str, db: Session = Depends(get_db)):
 # ---------------------------------------------------------------------------
 @router.get("/", tags=["Enhancements"])
 def list_reviews(
-    db: Session = Depends(get_db),
+    db: ShardedSession = Depends(get_db),
     start_date: Optional[str] = Query(None),
     end_date: Optional[str] = Query(None),
     min_rating: Optional[int] = Query(None, ge=1, le=5),
@@ -193,58 +209,80 @@ def list_reviews(
     """
     Advanced reporting endpoint:
     - Filter by date range, rating range, country
-    - Paginate results
+    - Paginate results (with shards, offset is capped at MAX_OFFSET: every
+      shard returns offset + limit rows to build the page)
     - Export CSV
     """
 
     start_dt = parse_date(start_date)
     end_dt = parse_date(end_date)
 
-    filters = []
-
-    # Date filtering (DB column is now TIMESTAMP)
-    if start_dt:
-        filters.append(Review.review_date >= start_dt)
-    if end_dt:
-        filters.append(Review.review_date <= end_dt)
-
-    # Rating filtering
-    if min_rating is not None:
-        filters.append(Review.rating >= min_rating)
-    if max_rating is not None:
-        filters.append(Review.rating <= max_rating)
-
-    # Base query
-    query = db.query(
-        Review.review_id,
-        Review.reviewer_id,
-        Review.business_id,
-        Review.review_title,
-        Review.content,
-        Review.rating,
-        Review.review_date,
-        Review.review_ip_address,
-    )
+    # Each shard returns its first offset + limit rows; the merged page is
+    # cut from those. A single shard paginates in the database.
+    if db.sharded:
+        if offset > MAX_OFFSET:
+            raise HTTPException(
+                status_code=400,
+                detail=f"offset must be at most {MAX_OFFSET}; "
+                       "narrow the date range to reach older reviews.",
+            )
+        shard_offset, shard_limit = 0, offset + limit
+    else:
+        shard_offset, shard_limit = offset, limit
+
+    def fetch(session):
+        # Only the partitions overlapping the date range are scanned
+        source = review_source(session.connection(), start_dt, end_dt)
+
+        # Date filtering (DB column is now TIMESTAMP)
+        filters = review_date_filters(session.connection(), source, start_dt, end_dt)
+
+        # Rating filtering
+        if min_rating is not None:
+            filters.append(source.c.rating >= min_rating)
+        if max_rating is not None:
+            filters.append(source.c.rating <= max_rating)
+
+        # Base query
+        query = session.query(
+            source.c.review_id,
+            source.c.reviewer_id,
+            source.c.business_id,
+            source.c.review_title,
+            source.c.content,
+            source.c.rating,
+            source.c.review_date,
+            source.c.review_ip_address,
+        )
 
-    # Country filtering (corrected)
-    if country:
-        query = query.join(User, User.reviewer_id == Review.reviewer_id)
-        filters.append(func.lower(User.reviewer_country) == country.lower())
+        # Country filtering (corrected)
+        if country:
+            query = query.join(User, User.reviewer_id == source.c.reviewer_id)
+            filters.append(func.lower(User.reviewer_country) == country.lower())
 
-    # Apply filters
-    if filters:
-        query = query.filter(and_(*filters))
+        # Apply filters
+        if filters:
+            query = query.filter(and_(*filters))
 
-    # Count before pagination
-    total_count = query.count()
+        # Count before pagination
+        shard_count = query.count()
 
-    # Apply pagination
-    results = (
-        query.order_by(Review.review_date.desc())
-        .offset(offset)
-        .limit(limit)
-        .all()
-    )
+        # Apply pagination
+        shard_results = (
+            query.order_by(source.c.review_date.desc())
+            .offset(shard_offset)
+            .limit(shard_limit)
+            .all()
+        )
+
+        return shard_count, shard_results
+
+    shard_pages = db.scatter(fetch)
+
+    total_count = sum(count for count, _ in shard_pages)
+    results = merge_by_review_date(page for _, page in shard_pages)
+    if db.sharded:
+        results = results[offset:offset + limit]
 
     rows = [
         (
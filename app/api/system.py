@@ -1,6 +1,9 @@
 from fastapi import APIRouter
-from sqlalchemy import text
-from app.db.session import engine
+from sqlalchemy import func, select, text
+from app.db.session import get_read_engine
+from app.db.sharding import get_sharded_read_session
+from app.db.partitions import review_source
+from app.services.admission import admission
 
 router = APIRouter()
 
@@ -10,10 +13,37 @@ def health_check():
 
 @router.get("/stats", tags=["Enhancements"])
 def stats():
-    with engine.connect() as conn:
-        return {
-            "staging_reviews": conn.execute(text("SELECT COUNT(*) FROM staging_reviews")).scalar(),
-            "users": conn.execute(text("SELECT COUNT(*) FROM users")).scalar(),
-            "businesses": conn.execute(text("SELECT COUNT(*) FROM businesses")).scalar(),
-            "reviews": conn.execute(text("SELECT COUNT(*) FROM reviews")).scalar(),
-        }
+    """
+    Table counts. staging_reviews is read from the ETL database; the other
+    tables are summed across shards. Users are stored on every shard that
+    holds one of their reviews, so with several shards `users` counts user
+    rows rather than distinct users.
+    """
+    with get_read_engine().connect() as conn:
+        staging_count = conn.execute(text("SELECT COUNT(*) FROM staging_reviews")).scalar()
+
+    def count_tables(session):
+        conn = session.connection()
+        return (
+            conn.execute(text("SELECT COUNT(*) FROM users")).scalar(),
+            conn.execute(text("SELECT COUNT(*) FROM businesses")).scalar(),
+            conn.execute(select(func.count()).select_from(review_source(conn))).scalar(),
+        )
+
+    db = get_sharded_read_session()
+    try:
+        users, businesses, reviews = (sum(c) for c in zip(*db.scatter(count_tables)))
+    finally:
+        db.close()
+
+    return {
+        "staging_reviews": staging_count,
+        "users": users,
+        "businesses": businesses,
+        "reviews": reviews,
+    }
+
+@router.get("/admission", tags=["Enhancements"])
+def admission_stats():
+    """Per-lane concurrency, queue depth and wait times."""
+    return admission.stats()
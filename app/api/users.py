@@ -1,45 +1,59 @@
+from itertools import chain
+
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from sqlalchemy import func
-from app.db.session import SessionLocal
-from app.db.models import User, Review
-from app.services.csv_export import generate_csv_response
+from sqlalchemy import func, select
+from app.db.sharding import ShardedSession, get_sharded_read_session, iter_by_review_date
+from app.db.models import User, Business
+from app.db.partitions import review_source
+from app.services.csv_export import generate_csv_response, generate_csv_sections_response
 
 router = APIRouter()
 
 def get_db():
-    db = SessionLocal()
+    db = get_sharded_read_session()
     try:
         yield db
     finally:
         db.close()
 
 @router.get("/{reviewer_id}")
-def get_user_account_info(reviewer_id: str, db: Session = Depends(get_db)):
+def get_user_account_info(reviewer_id: str, db: ShardedSession = Depends(get_db)):
     """
     Retrieve account information for a specific user.
     Returns results as a downloadable CSV file.
     """
 
-    user = (
-        db.query(
-            User.reviewer_id,
-            User.reviewer_name,
-            User.email_address,
-            User.reviewer_country,
+    def fetch(session):
+        user = (
+            session.query(
+                User.reviewer_id,
+                User.reviewer_name,
+                User.email_address,
+                User.reviewer_country,
+            )
+            .filter(User.reviewer_id == reviewer_id)
+            .first()
         )
-        .filter(User.reviewer_id == reviewer_id)
-        .first()
-    )
+
+        # Shards without a copy of the user hold none of their reviews
+        if not user:
+            return None, 0
+
+        reviews = review_source(session.connection())
+        review_count = (
+            session.query(func.count(reviews.c.review_id))
+            .filter(reviews.c.reviewer_id == reviewer_id)
+            .scalar()
+        )
+        return user, review_count
+
+    shard_results = db.scatter(fetch)
+    user = next((u for u, _ in shard_results if u is not None), None)
 
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
-    review_count = (
-        db.query(func.count(Review.review_id))
-        .filter(Review.reviewer_id == reviewer_id)
-        .scalar()
-    )
+    review_count = sum(count for _, count in shard_results)
 
     rows = [
         (
@@ -64,3 +78,133 @@ def get_user_account_info(reviewer_id: str, db: Session = Depends(get_db)):
         headers=headers,
         filename=f"user_account_info_{reviewer_id}.csv",
     )
+
+
+@router.get("/{reviewer_id}/subject-access", tags=["Enhancements"])
+def get_subject_access_export(reviewer_id: str, db: ShardedSession = Depends(get_db)):
+    """
+    Everything held about a user, for answering a data-subject request.
+
+    The account row, all of the user's reviews and the names of the
+    reviewed businesses are read with one joined query per shard (users
+    LEFT JOIN reviews LEFT JOIN businesses, using the reviewer_id index),
+    each in its own read-only transaction; on SQLite, resolving the month
+    tables adds a catalog lookup first. Every row carries the shard's review
+    count (a window count), so the "account" section is written from the
+    first row of each shard; the "reviews" section then streams the rest,
+    merged by date across shards, without holding the history in memory.
+    """
+
+    def fetch(session):
+        # One consistent snapshot for the whole export
+        options = {}
+        if session.get_bind().dialect.name == "postgresql":
+            options = {"isolation_level": "REPEATABLE READ", "postgresql_readonly": True}
+        conn = session.connection(execution_options=options)
+
+        # Filter reviews before the join so the reviewer_id predicate reaches
+        # every partition
+        source = review_source(conn)
+        reviews = (
+            select(
+                source.c.review_id,
+                source.c.reviewer_id,
+                source.c.business_id,
+                source.c.review_title,
+                source.c.content,
+                source.c.rating,
+                source.c.review_date,
+                source.c.review_ip_address,
+            )
+            .where(source.c.reviewer_id == reviewer_id)
+            .subquery("user_reviews")
+        )
+
+        result = conn.execute(
+            select(
+                User.reviewer_id,
+                User.reviewer_name,
+                User.email_address,
+                User.reviewer_country,
+                reviews.c.review_id,
+                reviews.c.business_id,
+                Business.business_name,
+                reviews.c.review_title,
+                reviews.c.content,
+                reviews.c.rating,
+                reviews.c.review_date,
+                reviews.c.review_ip_address,
+                func.count(reviews.c.review_id).over().label("number_of_reviews"),
+            )
+            .select_from(
+                User.__table__
+                .outerjoin(reviews, reviews.c.reviewer_id == User.reviewer_id)
+                .outerjoin(Business.__table__, Business.business_id == reviews.c.business_id)
+            )
+            .where(User.reviewer_id == reviewer_id)
+            .order_by(reviews.c.review_date.desc()),
+            execution_options={"stream_results": True},
+        )
+
+        # The first row answers the account section; the cursor stays open
+        # for the reviews section
+        first = result.fetchone()
+        if first is None:
+            result.close()
+            return None, []
+        return first, chain([first], result)
+
+    # One joined query per shard, run in parallel; a user's reviews can be on
+    # any shard, each shard that has them also has the account row
+    shard_results = db.scatter(fetch)
+    firsts = [first for first, _ in shard_results if first is not None]
+
+    if not firsts:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    account = firsts[0]
+    review_rows = (
+        r for r in iter_by_review_date(rows for _, rows in shard_results)
+        if r.review_id is not None
+    )
+
+    account_headers = [
+        "reviewer_id",
+        "reviewer_name",
+        "email_address",
+        "reviewer_country",
+        "number_of_reviews",
+    ]
+
+    review_headers = [
+        "review_id",
+        "business_id",
+        "business_name",
+        "review_title",
+        "content",
+        "rating",
+        "review_date",
+        "review_ip_address",
+    ]
+
+    sections = [
+        (
+            "account",
+            account_headers,
+            [
+                (
+                    account.reviewer_id,
+                    account.reviewer_name,
+                    account.email_address,
+                    account.reviewer_country,
+                    sum(first.number_of_reviews for first in firsts),
+                )
+            ],
+        ),
+        ("reviews", review_headers, review_rows),
+    ]
+
+    return generate_csv_sections_response(
+        sections=sections,
+        filename=f"subject_access_{reviewer_id}.csv",
+    )
@@ -0,0 +1,36 @@
+"""
+Content fingerprints used for review deduplication.
+
+A fingerprint is a 16-byte BLAKE2b digest (stored as 32 hex characters)
+over the fields that define a duplicate review:
+review_id, reviewer_id, business_id, review_date, content.
+
+Comparing fingerprints instead of the raw fields means deduplication only
+has to remember one short digest per unique review, not its full text.
+"""
+
+import hashlib
+
+import pandas as pd
+
+FINGERPRINT_FIELDS = ["review_id", "reviewer_id", "business_id", "review_date", "content"]
+
+# Hex digest length of a 16-byte digest
+FINGERPRINT_LENGTH = 32
+
+
+def _as_text(series: pd.Series) -> pd.Series:
+    """Render a column as text, with nulls (None / NaN / NaT) as ''."""
+    return series.astype(object).where(series.notna(), "").map(str)
+
+
+def content_fingerprints(df: pd.DataFrame) -> pd.Series:
+    """Return the fingerprint of every row in a staging-shaped DataFrame."""
+    parts = [_as_text(df[field]) for field in FINGERPRINT_FIELDS]
+    keys = parts[0].str.cat(parts[1:], sep="\x1f")
+
+    return pd.Series(
+        [hashlib.blake2b(key.encode("utf-8"), digest_size=16).hexdigest() for key in keys],
+        index=df.index,
+        dtype=object,
+    )
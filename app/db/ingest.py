@@ -3,37 +3,85 @@ CSV ingestion script for Trustpilot Legal Reporting API.
 
 This script:
 - Creates database tables if they don't exist
-- Reads a CSV file containing review data
-- Normalises column types (dates, integers)
-- Upserts Users and Businesses
-- Inserts or updates Reviews
+- Reads a CSV file containing review data in chunks
+- Validates each chunk (dates, ratings, required fields, IP addresses)
+  and sends failing rows to quarantined_reviews with the reason
+- Writes the clean rows to users, businesses, reviews and the rollups
+  (deduplicated and routed to their shard), one committed batch per chunk
+- Republishes the read-only snapshots the API reads from
 - Can be run from the command line using:
       python -m app.db.ingest data/reviews.csv
 """
 
 import sys
 import os
+from contextlib import ExitStack
+
 import pandas as pd
-from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session
 
-from app.db.session import engine, SessionLocal
-from app.db.models import Base, User, Business, Review
+from app.db.session import engine
+from app.db.models import Base
+from app.db.partitions import list_partitions, move_flat_reviews
+from app.db.rollups import rebuild_rollups, rollups_exist
+from app.db.sharding import publish_snapshots, shard_engines, unique_engines
+from app.db.validation import LOAD_ERRORS, failed_batch, quarantine_metadata, write_quarantine
+from scripts.ingest_reviews import (
+    CHUNK_ROWS,
+    COLUMN_MAP,
+    ensure_staging_table,
+    prepare_staging_frame,
+)
+from scripts.normalise_data import ReviewNormaliser, ensure_review_fingerprints
 
 
 def create_tables():
     """
-    Create all database tables defined in SQLAlchemy models.
+    Create all database tables defined in SQLAlchemy models (on every
+    shard), the staging table read by /stats and the quarantine table, and
+    bring databases from older releases up to date (review fingerprints,
+    flat reviews rows moved into month tables, rollups built from the
+    existing reviews).
 
     Safe to call multiple times because SQLAlchemy checks for existence.
     """
-    Base.metadata.create_all(bind=engine)
+    for shard in unique_engines(shard_engines):
+        with shard.connect() as conn:
+            new_rollups = not rollups_exist(conn)
+
+        Base.metadata.create_all(bind=shard)
+        ensure_review_fingerprints(shard)
+
+        # Flat reviews rows of a partly partitioned database are hidden
+        # from reads until moved into month tables
+        with shard.begin() as conn:
+            if list_partitions(conn):
+                move_flat_reviews(conn)
+
+        # Rollups added to an existing database start from its reviews
+        if new_rollups:
+            with shard.begin() as conn:
+                rebuild_rollups(conn)
+    ensure_staging_table(engine)
+    quarantine_metadata.create_all(bind=engine)
+
 
+def _begin_shards(stack: ExitStack):
+    """Open one transaction per shard database, shared by repeated shards."""
+    conns = {}
+    for shard in shard_engines:
+        if shard.url not in conns:
+            conns[shard.url] = stack.enter_context(shard.begin())
+    return [conns[shard.url] for shard in shard_engines]
 
-def ingest_reviews(csv_path: str):
+
+def ingest_reviews(csv_path: str, chunksize: int = CHUNK_ROWS):
     """
     Ingest a CSV file into the database.
 
+    Every chunk is committed on its own: invalid rows are quarantined and
+    the rest of the chunk is loaded, and a chunk that still fails to write
+    is quarantined as a whole without undoing the chunks before it.
+
     Expected CSV columns:
     - Reviewer Id
     - Reviewer Name
@@ -53,64 +101,57 @@ def ingest_reviews(csv_path: str):
     if not os.path.exists(csv_path):
         raise FileNotFoundError(f"CSV file not found: {csv_path}")
 
-    # Load CSV into a DataFrame
-    df = pd.read_csv(csv_path)
-
-    # Normalise column names (remove trailing spaces)
-    df.columns = [col.strip() for col in df.columns]
-
-    # Convert date and rating fields to correct types
-    df["Review Date"] = pd.to_datetime(df["Review Date"], utc=True)
-    df["Review Rating"] = df["Review Rating"].astype(int)
-
-    # Create a database session
-    session: Session = SessionLocal()
-
-    try:
-        for _, row in df.iterrows():
-
-            # Upsert User record
-            user = User(
-                reviewer_id=row["Reviewer Id"],
-                reviewer_name=row["Reviewer Name"],
-                email_address=row["Email Address"],
-                reviewer_country=row["Reviewer Country"],
-            )
-            session.merge(user)
-
-            # Upsert Business record
-            business = Business(
-                business_id=row["Business Id"],
-                business_name=row["Business Name"],
-            )
-            session.merge(business)
-
-            # Insert or update Review record
-            review = Review(
-                review_id=row["Review Id"],
-                reviewer_id=row["Reviewer Id"],
-                business_id=row["Business Id"],
-                review_title=row["Review Title"],
-                review_content=row["Review Content"],
-                review_rating=row["Review Rating"],
-                review_date=row["Review Date"],
-                review_ip_address=row["Review IP Address"],
-            )
-            session.merge(review)
-
-        # Commit all changes after processing the file
-        session.commit()
-        print(f"Ingestion complete. Rows processed: {len(df)}")
-
-    except Exception as exc:
-        # Roll back the transaction on any error
-        session.rollback()
-        print(f"Error during ingestion: {exc}")
-        raise
-
-    finally:
-        # Always close the session
-        session.close()
+    with ExitStack() as stack:
+        normaliser = ReviewNormaliser(_begin_shards(stack))
+
+    loaded = quarantined = failed_batches = 0
+
+    # Load CSV as text, so quarantined rows keep their raw values
+    for chunk in pd.read_csv(csv_path, dtype=str, chunksize=chunksize):
+
+        # Normalise column names (remove trailing spaces)
+        chunk.columns = [col.strip() for col in chunk.columns]
+
+        df, rejected = prepare_staging_frame(chunk)
+
+        with engine.begin() as conn:
+            quarantined += write_quarantine(conn, rejected, csv_path)
+
+        try:
+            with ExitStack() as stack:
+                new, conflicts = normaliser.load(_begin_shards(stack), df)
+
+        except LOAD_ERRORS as exc:
+            # Keep the batch for inspection and carry on with the next one
+            failed_batches += 1
+            print(f"Error during ingestion, batch quarantined: {exc}")
+
+            with engine.begin() as conn:
+                quarantined += write_quarantine(
+                    conn,
+                    failed_batch(chunk.loc[df.index].rename(columns=COLUMN_MAP), exc),
+                    csv_path,
+                )
+
+            # The rolled-back batch may have updated the dedup state
+            with ExitStack() as stack:
+                normaliser = ReviewNormaliser(_begin_shards(stack))
+            continue
+
+        loaded += new
+
+        # Reused review_ids with different content (see ReviewNormaliser.load)
+        with engine.begin() as conn:
+            quarantined += write_quarantine(conn, conflicts, csv_path)
+
+    print(
+        f"Ingestion complete. Reviews loaded: {loaded}, "
+        f"rows quarantined: {quarantined}, failed batches: {failed_batches}"
+    )
+
+    # The API reads from the snapshots, so republish them
+    for snapshot in publish_snapshots():
+        print(f"Published read-only snapshot: {snapshot}")
 
 
 if __name__ == "__main__":
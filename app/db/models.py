@@ -5,6 +5,7 @@ Defines:
 - User
 - Business
 - Review
+- Rollup tables maintained by the ingestion pipeline (see rollups.py)
 
 These models map directly to database tables.
 """
@@ -12,6 +13,8 @@ These models map directly to database tables.
 from sqlalchemy import Column, String, Integer, DateTime, ForeignKey
 from sqlalchemy.orm import declarative_base, relationship
 
+from app.db.fingerprint import FINGERPRINT_LENGTH
+
 Base = declarative_base()
 
 
@@ -40,17 +43,59 @@ class Business(Base):
 class Review(Base):
     __tablename__ = "reviews"
 
+    # Range-partitioned by month on PostgreSQL; per-month tables on SQLite.
+    # Partitions are created during ingestion (see partitions.py).
+    __table_args__ = {"postgresql_partition_by": "RANGE (review_date)"}
+
+    # The partition key must be part of the primary key
     review_id = Column(String, primary_key=True)
-    reviewer_id = Column(String, ForeignKey("users.reviewer_id"), nullable=False)
-    business_id = Column(String, ForeignKey("businesses.business_id"), nullable=False)
+    reviewer_id = Column(String, ForeignKey("users.reviewer_id"), nullable=False, index=True)
+    business_id = Column(String, ForeignKey("businesses.business_id"), nullable=False, index=True)
 
     # Correct fields based on your dataset
     review_title = Column(String, nullable=False)
     content = Column(String, nullable=False)
     rating = Column(Integer, nullable=False)
-    review_date = Column(DateTime(timezone=True), nullable=False)
+    review_date = Column(DateTime(timezone=True), primary_key=True, index=True)
     review_ip_address = Column(String, nullable=False)
 
+    # Deduplication key carried over from staging (see app/db/fingerprint.py)
+    content_fingerprint = Column(String(FINGERPRINT_LENGTH), index=True)
+
     # Relationships
     user = relationship("User", back_populates="reviews")
     business = relationship("Business", back_populates="reviews")
+
+
+# ---------------------------------------------------------------------------
+# Rollups: pre-aggregated review counts, updated incrementally on ingestion.
+# `month` is stored as 'YYYY-MM' so it sorts and compares the same way on
+# SQLite and PostgreSQL.
+# ---------------------------------------------------------------------------
+class BusinessMonthRollup(Base):
+    __tablename__ = "rollup_business_month"
+
+    business_id = Column(String, primary_key=True)
+    month = Column(String(7), primary_key=True)
+    rating = Column(Integer, primary_key=True)
+    reviewer_country = Column(String, primary_key=True)
+    review_count = Column(Integer, nullable=False, default=0)
+
+
+class CountryMonthRollup(Base):
+    __tablename__ = "rollup_country_month"
+
+    reviewer_country = Column(String, primary_key=True)
+    month = Column(String(7), primary_key=True)
+    rating = Column(Integer, primary_key=True)
+    review_count = Column(Integer, nullable=False, default=0)
+
+
+class UserMonthRollup(Base):
+    __tablename__ = "rollup_user_month"
+
+    reviewer_id = Column(String, primary_key=True)
+    month = Column(String(7), primary_key=True)
+    rating = Column(Integer, primary_key=True)
+    reviewer_country = Column(String, nullable=False)
+    review_count = Column(Integer, nullable=False, default=0)
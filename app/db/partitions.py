@@ -0,0 +1,247 @@
+"""
+Monthly partitioning of the reviews table.
+
+PostgreSQL:
+- `reviews` is declared PARTITION BY RANGE (review_date) (see models.py)
+- One partition per month, reviews_pYYYY_MM, created on demand during
+  ingestion; inserts into `reviews` are routed by the database and the
+  planner prunes partitions for review_date predicates
+
+SQLite (no native partitioning):
+- Rows are written directly to per-month tables with the same columns
+  and indexes as `reviews`
+- `review_source` is the routing layer for reads: it returns the union of
+  only those month tables that overlap the requested date range
+- Rows in the flat `reviews` table (databases loaded before partitioning)
+  are moved into month tables by `move_flat_reviews` when partitions are
+  created, so they stay visible to reads and purges
+
+In both cases purging a month is a table drop (`drop_partition`), not a
+DELETE over the whole table.
+"""
+
+import re
+import threading
+from datetime import datetime
+from typing import Iterable, Optional
+
+import pandas as pd
+from sqlalchemy import Column, Index, MetaData, Table, false, func, inspect, select, text, union_all
+
+from app.db.models import Review, BusinessMonthRollup, CountryMonthRollup, UserMonthRollup
+from app.db.rollups import review_month
+
+PARTITION_PATTERN = re.compile(r"^reviews_p(\d{4})_(\d{2})$")
+
+# SQLite month tables, built lazily from the Review definition
+_partition_metadata = MetaData()
+# Shard threads resolve month tables concurrently; guards _partition_metadata
+_partition_lock = threading.Lock()
+
+
+def partition_name(month: str) -> str:
+    """'2024-10' -> 'reviews_p2024_10'"""
+    year, mon = month.split("-")
+    return f"reviews_p{year}_{mon}"
+
+
+def month_bounds(month: str):
+    """Return the [start, end) dates of a 'YYYY-MM' month as ISO strings."""
+    start = datetime.strptime(month, "%Y-%m")
+    if start.month == 12:
+        end = start.replace(year=start.year + 1, month=1)
+    else:
+        end = start.replace(month=start.month + 1)
+    return start.date().isoformat(), end.date().isoformat()
+
+
+def _sqlite_partition(name: str) -> Table:
+    """Table object for a SQLite month table (same shape as reviews)."""
+    with _partition_lock:
+        if name in _partition_metadata.tables:
+            return _partition_metadata.tables[name]
+        return _build_sqlite_partition(name)
+
+
+def _build_sqlite_partition(name: str) -> Table:
+    template = Review.__table__
+    columns = [
+        Column(c.name, c.type, primary_key=c.primary_key, nullable=c.nullable)
+        for c in template.columns
+    ]
+    # Index names are global in SQLite, so each month gets its own
+    indexes = [
+        Index(f"ix_{name}_{c.name}", c.name)
+        for c in template.columns if c.index
+    ]
+    return Table(name, _partition_metadata, *columns, *indexes)
+
+
+def list_partitions(conn) -> list:
+    """Return the months ('YYYY-MM') that currently have a partition."""
+    months = []
+    for table_name in inspect(conn).get_table_names():
+        match = PARTITION_PATTERN.match(table_name)
+        if match:
+            months.append(f"{match.group(1)}-{match.group(2)}")
+    return sorted(months)
+
+
+def move_flat_reviews(conn) -> int:
+    """
+    SQLite: move rows from the flat `reviews` table into their month tables.
+
+    Once any month table exists, reads only look at month tables, so rows
+    loaded before partitioning would otherwise disappear. Rows already in a
+    month table are left as they are. Returns the number of rows moved.
+    """
+    if conn.dialect.name == "postgresql":
+        return 0
+    if conn.execute(text("SELECT 1 FROM reviews LIMIT 1")).first() is None:
+        return 0
+
+    month = "strftime('%Y-%m', review_date)"
+    months = conn.execute(text(
+        f"SELECT DISTINCT {month} FROM reviews WHERE {month} IS NOT NULL"
+    )).scalars().all()
+    ensure_partitions(conn, months, move_flat=False)
+
+    columns = ", ".join(c.name for c in Review.__table__.columns)
+    for m in months:
+        conn.execute(
+            text(
+                f"INSERT OR IGNORE INTO {partition_name(m)} ({columns}) "
+                f"SELECT {columns} FROM reviews WHERE {month} = :month"
+            ),
+            {"month": m},
+        )
+    return conn.execute(text(f"DELETE FROM reviews WHERE {month} IS NOT NULL")).rowcount
+
+
+def ensure_partitions(conn, months: Iterable[str], move_flat: bool = True):
+    """
+    Create any missing month partitions (and, on SQLite, move rows left in
+    the flat reviews table into them, see `move_flat_reviews`).
+    """
+    existing = set(list_partitions(conn))
+
+    for month in sorted(set(months) - existing):
+        name = partition_name(month)
+        if conn.dialect.name == "postgresql":
+            start, end = month_bounds(month)
+            conn.execute(text(
+                f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF reviews "
+                f"FOR VALUES FROM ('{start}') TO ('{end}')"
+            ))
+        else:
+            _sqlite_partition(name).create(conn, checkfirst=True)
+
+    if move_flat:
+        move_flat_reviews(conn)
+
+
+def write_reviews(conn, reviews: pd.DataFrame):
+    """
+    Insert a batch of reviews, creating month partitions as needed.
+
+    On PostgreSQL the batch goes to `reviews` and the database routes each
+    row; on SQLite it is split by month and written to each month table.
+    """
+    if reviews.empty:
+        return
+
+    months = review_month(reviews["review_date"])
+    if months.isna().any():
+        raise ValueError("Reviews without a valid review_date cannot be partitioned")
+
+    ensure_partitions(conn, months.unique())
+
+    if conn.dialect.name == "postgresql":
+        reviews.to_sql("reviews", conn, if_exists="append", index=False)
+        return
+
+    for month, batch in reviews.groupby(months):
+        batch.to_sql(partition_name(month), conn, if_exists="append", index=False)
+
+
+def review_source(conn, start: Optional[datetime] = None, end: Optional[datetime] = None):
+    """
+    Return a selectable with the reviews columns, limited to the partitions
+    that can hold rows between `start` and `end`.
+
+    PostgreSQL prunes natively, so this is simply the reviews table. On
+    SQLite it is a UNION ALL over the overlapping month tables; a database
+    without month tables (loaded before partitioning) reads `reviews`. Once
+    month tables exist the flat rows have been moved into them.
+    """
+    if conn.dialect.name == "postgresql":
+        return Review.__table__
+
+    months = list_partitions(conn)
+    if not months:
+        return Review.__table__
+
+    first = start.strftime("%Y-%m") if start else None
+    last = end.strftime("%Y-%m") if end else None
+    selected = [
+        m for m in months
+        if (first is None or m >= first) and (last is None or m <= last)
+    ]
+
+    if not selected:
+        # Nothing can match; keep the column layout with an empty result
+        return select(Review.__table__).where(false()).subquery("reviews")
+
+    tables = [_sqlite_partition(partition_name(m)) for m in selected]
+    if len(tables) == 1:
+        return tables[0]
+    return union_all(*[select(t) for t in tables]).subquery("reviews")
+
+
+def review_date_filters(conn, source, start: Optional[datetime] = None,
+                        end: Optional[datetime] = None) -> list:
+    """
+    Filters for `start <= review_date <= end` on a review_source selectable.
+
+    SQLite stores the dates as text, either 'YYYY-MM-DD' or with a time, so
+    both sides are compared through datetime(); otherwise a review dated on
+    the start day would sort before the bound and be missed.
+    """
+    column = source.c.review_date
+    if conn.dialect.name == "sqlite":
+        column = func.datetime(column)
+        start, end = (
+            bound.strftime("%Y-%m-%d %H:%M:%S") if bound else None
+            for bound in (start, end)
+        )
+
+    filters = []
+    if start:
+        filters.append(column >= start)
+    if end:
+        filters.append(column <= end)
+    return filters
+
+
+def drop_partition(conn, month: str):
+    """
+    Purge one month of reviews by dropping its partition.
+
+    The month's rollup rows are removed in the same transaction so that
+    aggregates keep matching the retained reviews.
+    """
+    name = partition_name(month)
+
+    if month in list_partitions(conn):
+        if conn.dialect.name == "postgresql":
+            conn.execute(text(f"ALTER TABLE reviews DETACH PARTITION {name}"))
+        conn.execute(text(f"DROP TABLE {name}"))
+
+    for model in (BusinessMonthRollup, CountryMonthRollup, UserMonthRollup):
+        conn.execute(model.__table__.delete().where(model.month == month))
+
+
+def drop_all_partitions(conn):
+    """Drop every month table (SQLite tables are not part of Base.metadata)."""
+    for month in list_partitions(conn):
+        conn.execute(text(f"DROP TABLE IF EXISTS {partition_name(month)}"))
@@ -0,0 +1,136 @@
+"""
+Read/write routing for reporting queries.
+
+The ETL scripts write through the primary engine. The API routers read
+through a ReadRouter, which picks:
+- READ_DATABASE_URL (e.g. a PostgreSQL streaming replica), if configured
+- otherwise, for a SQLite primary, the read-only snapshot file published
+  by `publish_snapshot` at the end of every ETL run
+- otherwise the primary itself
+
+Because the snapshot is swapped in atomically, report queries never wait
+on locks held by a running load and always see the last completed run.
+"""
+
+import os
+import time
+import sqlite3
+from typing import Optional
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import NullPool
+
+# How long a measured replica lag is trusted before it is checked again
+LAG_CHECK_INTERVAL_SECONDS = 5.0
+
+
+def snapshot_path(engine: Engine) -> Optional[str]:
+    """Return the snapshot file for a file-backed SQLite engine, else None."""
+    if engine.dialect.name != "sqlite":
+        return None
+
+    database = engine.url.database
+    if not database or database == ":memory:" or database.startswith("file:"):
+        return None
+
+    root, ext = os.path.splitext(os.path.abspath(database))
+    return f"{root}.snapshot{ext or '.db'}"
+
+
+def publish_snapshot(engine: Engine) -> Optional[str]:
+    """
+    Copy a SQLite database to its snapshot file and swap it in atomically.
+
+    The copy is written next to the target and renamed over it, so readers
+    either open the previous snapshot or the new one, never a partial file.
+    Returns the snapshot path, or None when the engine is not file-backed
+    SQLite (replicas are kept current by the database itself).
+    """
+    path = snapshot_path(engine)
+    if path is None:
+        return None
+
+    tmp_path = f"{path}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    source = engine.raw_connection()
+    try:
+        target = sqlite3.connect(tmp_path)
+        try:
+            source.driver_connection.backup(target)
+        finally:
+            target.close()
+    finally:
+        source.close()
+
+    os.replace(tmp_path, path)
+    return path
+
+
+class ReadRouter:
+    """
+    Choose the engine used for read-only report queries.
+
+    Args:
+        primary: The write engine (always a valid fallback)
+        replica_url: Optional replica connection string
+        max_lag_seconds: If set, reads fall back to the primary while a
+            PostgreSQL replica is further behind than this
+    """
+
+    def __init__(self, primary: Engine, replica_url: Optional[str] = None,
+                 max_lag_seconds: Optional[float] = None):
+        self.primary = primary
+        self.replica_url = replica_url
+        self.max_lag_seconds = max_lag_seconds
+
+        self._replica: Optional[Engine] = None
+        self._snapshot: Optional[Engine] = None
+        self._lag_checked_at = 0.0
+        self._lag = 0.0
+
+    def engine(self) -> Engine:
+        """Return the engine the next read should use."""
+        if self.replica_url:
+            if self._replica is None:
+                self._replica = create_engine(self.replica_url)
+            if self._replica_too_far_behind():
+                return self.primary
+            return self._replica
+
+        path = snapshot_path(self.primary)
+        if path is None or not os.path.exists(path):
+            return self.primary
+
+        if self._snapshot is None:
+            # NullPool: every session opens the file afresh, so a newly
+            # published snapshot is picked up on the next request.
+            self._snapshot = create_engine(
+                f"sqlite:///file:{path}?mode=ro&uri=true",
+                poolclass=NullPool,
+            )
+        return self._snapshot
+
+    def _replica_too_far_behind(self) -> bool:
+        if not self.max_lag_seconds or self._replica.dialect.name != "postgresql":
+            return False
+
+        now = time.monotonic()
+        if now - self._lag_checked_at >= LAG_CHECK_INTERVAL_SECONDS:
+            try:
+                with self._replica.connect() as conn:
+                    # Fully replayed replicas report 0 even when idle
+                    self._lag = float(conn.execute(text(
+                        "SELECT CASE "
+                        "WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+                        "ELSE COALESCE(EXTRACT(EPOCH FROM "
+                        "now() - pg_last_xact_replay_timestamp()), 0) END"
+                    )).scalar())
+            except Exception:
+                # An unreachable replica is treated as infinitely behind
+                self._lag = float("inf")
+            self._lag_checked_at = now
+
+        return self._lag > self.max_lag_seconds
@@ -0,0 +1,119 @@
+"""
+Incremental maintenance of the rollup tables.
+
+The ingestion pipeline calls `apply_rollup_deltas` with every batch of
+newly inserted reviews. The batch is grouped in memory and the counts are
+added to the existing rollup rows with a single upsert per table, so the
+cost of keeping rollups current is proportional to the batch, not to the
+size of the reviews table.
+
+`rebuild_rollups` recomputes them from scratch from the reviews a shard
+holds; it fills newly created rollup tables on existing databases and is
+exposed as `python -m scripts.rebuild_rollups`.
+
+Rollup dimensions:
+- rollup_business_month: business_id, month, rating, reviewer_country
+- rollup_country_month:  reviewer_country, month, rating
+- rollup_user_month:     reviewer_id, month, rating (+ reviewer_country)
+"""
+
+import pandas as pd
+from sqlalchemy import inspect, select
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.db.models import BusinessMonthRollup, CountryMonthRollup, UserMonthRollup, User
+
+# Reviews read per chunk when rebuilding
+REBUILD_CHUNK_ROWS = 50_000
+
+# Rollup model -> primary key columns
+ROLLUP_KEYS = {
+    BusinessMonthRollup: ["business_id", "month", "rating", "reviewer_country"],
+    CountryMonthRollup: ["reviewer_country", "month", "rating"],
+    UserMonthRollup: ["reviewer_id", "month", "rating"],
+}
+
+
+def review_month(dates: pd.Series) -> pd.Series:
+    """Map review dates (strings, dates or timestamps) to 'YYYY-MM'."""
+    return pd.to_datetime(dates, utc=True).dt.strftime("%Y-%m")
+
+
+def _insert(conn, model):
+    """Dialect-specific INSERT that supports ON CONFLICT."""
+    if conn.dialect.name == "postgresql":
+        return postgresql.insert(model)
+    if conn.dialect.name == "sqlite":
+        return sqlite.insert(model)
+    raise NotImplementedError(f"Rollup upserts are not supported on {conn.dialect.name}")
+
+
+def apply_rollup_deltas(conn, reviews: pd.DataFrame):
+    """
+    Add a batch of new reviews to every rollup table.
+
+    Args:
+        conn: Connection inside the ingestion transaction
+        reviews: One row per inserted review, with business_id, reviewer_id,
+            reviewer_country, rating and review_date
+    """
+    if reviews.empty:
+        return
+
+    frame = reviews.assign(month=review_month(reviews["review_date"]))
+
+    for model, keys in ROLLUP_KEYS.items():
+        columns = keys + (["reviewer_country"] if model is UserMonthRollup else [])
+        deltas = (
+            frame.groupby(columns, dropna=False)
+            .size()
+            .reset_index(name="review_count")
+        )
+        # numpy scalars -> Python values for the DBAPI
+        records = deltas.astype(object).to_dict(orient="records")
+
+        stmt = _insert(conn, model)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=keys,
+            set_={"review_count": model.review_count + stmt.excluded.review_count},
+        )
+        conn.execute(stmt, records)
+
+
+def rollups_exist(conn) -> bool:
+    """True if every rollup table exists."""
+    tables = set(inspect(conn).get_table_names())
+    return all(model.__tablename__ in tables for model in ROLLUP_KEYS)
+
+
+def rebuild_rollups(conn, chunksize: int = REBUILD_CHUNK_ROWS) -> int:
+    """
+    Recompute every rollup table from the reviews on this connection's
+    database. Returns the number of reviews counted.
+
+    Existing rollup rows are deleted first, so this is safe to rerun. The
+    reviewer's country comes from users, as during ingestion.
+    """
+    # partitions imports review_month from this module
+    from app.db.partitions import review_source
+
+    for model in ROLLUP_KEYS:
+        conn.execute(model.__table__.delete())
+
+    source = review_source(conn)
+    query = (
+        select(
+            source.c.business_id,
+            source.c.reviewer_id,
+            source.c.rating,
+            source.c.review_date,
+            User.reviewer_country,
+        )
+        .select_from(source.outerjoin(User.__table__, User.reviewer_id == source.c.reviewer_id))
+    )
+
+    counted = 0
+    for chunk in pd.read_sql(query, conn, chunksize=chunksize):
+        apply_rollup_deltas(conn, chunk)
+        counted += len(chunk)
+    return counted
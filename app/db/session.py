@@ -5,6 +5,7 @@ This module is responsible for:
 - Loading the DATABASE_URL from environment variables
 - Creating the SQLAlchemy engine
 - Creating a SessionLocal factory for request-scoped DB sessions
+- Routing API reads to a replica or read-only snapshot (see replica.py)
 
 This design ensures:
 - Local development uses .env (localhost)
@@ -14,9 +15,11 @@ This design ensures:
 
 import os
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 from dotenv import load_dotenv
 
+from app.db.replica import ReadRouter
+
 # Load environment variables from .env (Windows local development)
 load_dotenv()
 
@@ -35,3 +38,25 @@ engine = create_engine(DATABASE_URL)
 # Create a session factory.
 # autocommit=False and autoflush=False give explicit control over transactions.
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# Optional read replica for the API. Without one, a SQLite primary is read
+# through the snapshot published after each ETL run (if present).
+READ_DATABASE_URL = os.getenv("READ_DATABASE_URL")
+
+# Fall back to the primary while the replica lags by more than this (seconds)
+READ_MAX_LAG_SECONDS = float(os.getenv("READ_MAX_LAG_SECONDS", "0")) or None
+
+read_router = ReadRouter(engine, READ_DATABASE_URL, READ_MAX_LAG_SECONDS)
+
+# Session factory for report queries; bound per session to the routed engine
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False)
+
+
+def get_read_engine():
+    """Engine for read-only report queries."""
+    return read_router.engine()
+
+
+def get_read_session() -> Session:
+    """Open a session on the read engine (replica, snapshot or primary)."""
+    return ReadSessionLocal(bind=get_read_engine())
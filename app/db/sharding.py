@@ -0,0 +1,169 @@
+"""
+Hash sharding of the reporting tables across several databases.
+
+users, businesses, reviews and the rollups live on N shard databases;
+staging_reviews stays on DATABASE_URL, where the ETL runs.
+
+- A business and all of its reviews live on shard `shard_index(business_id)`
+- A user row is stored on every shard that holds one of their reviews,
+  so joins (country filter, subject access) stay shard-local
+- Business-scoped reads hit a single shard; everything else is
+  scatter-gathered across shards in parallel and merged by the caller
+
+Configuration:
+- SHARD_DATABASE_URLS: comma-separated shard URLs (several SQLite files
+  locally, several PostgreSQL URLs in production). Unset means a single
+  shard: DATABASE_URL itself, i.e. the unsharded layout.
+- SHARD_READ_DATABASE_URLS: optional comma-separated replicas, one per
+  shard (same order). Without them each shard is read through its own
+  snapshot / primary, exactly like READ_DATABASE_URL for one database.
+
+The shard count and order must not change once data has been loaded.
+"""
+
+import os
+import heapq
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterator, List
+
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.orm import Session
+
+from app.db.replica import ReadRouter, publish_snapshot
+from app.db.session import (
+    engine,
+    read_router,
+    ReadSessionLocal,
+    READ_MAX_LAG_SECONDS,
+)
+
+
+def _split_urls(value):
+    return [url.strip() for url in (value or "").split(",") if url.strip()]
+
+
+SHARD_DATABASE_URLS = _split_urls(os.getenv("SHARD_DATABASE_URLS"))
+SHARD_READ_DATABASE_URLS = _split_urls(os.getenv("SHARD_READ_DATABASE_URLS"))
+
+if SHARD_READ_DATABASE_URLS and len(SHARD_READ_DATABASE_URLS) != len(SHARD_DATABASE_URLS):
+    raise RuntimeError(
+        "SHARD_READ_DATABASE_URLS must list one replica per entry in SHARD_DATABASE_URLS."
+    )
+
+if SHARD_DATABASE_URLS:
+    # Reuse the primary engine if it is also one of the shards
+    shard_engines: List[Engine] = [
+        engine if make_url(url) == engine.url else create_engine(url)
+        for url in SHARD_DATABASE_URLS
+    ]
+    shard_read_routers = [
+        ReadRouter(
+            shard,
+            SHARD_READ_DATABASE_URLS[i] if SHARD_READ_DATABASE_URLS else None,
+            READ_MAX_LAG_SECONDS,
+        )
+        for i, shard in enumerate(shard_engines)
+    ]
+else:
+    shard_engines = [engine]
+    shard_read_routers = [read_router]
+
+SHARD_COUNT = len(shard_engines)
+
+# Threads used to query shards in parallel
+_scatter_pool = ThreadPoolExecutor(
+    max_workers=SHARD_COUNT * 4,
+    thread_name_prefix="shard-scatter",
+) if SHARD_COUNT > 1 else None
+
+
+def unique_engines(engines) -> List[Engine]:
+    """Drop repeated databases (e.g. the primary also listed as a shard)."""
+    unique = []
+    for candidate in engines:
+        if all(candidate.url != e.url for e in unique):
+            unique.append(candidate)
+    return unique
+
+
+def publish_snapshots() -> List[str]:
+    """
+    Republish the read snapshot of the ETL database and of every shard,
+    once per database; returns the snapshot paths written (SQLite only).
+    """
+    published = []
+    for target in unique_engines([engine, *shard_engines]):
+        path = publish_snapshot(target)
+        if path:
+            published.append(path)
+    return published
+
+
+def shard_index(business_id: str) -> int:
+    """Stable shard number for a business (independent of PYTHONHASHSEED)."""
+    digest = hashlib.blake2b(str(business_id).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % SHARD_COUNT
+
+
+class ShardedSession:
+    """
+    Request-scoped read sessions, one per shard, opened on first use.
+
+    Use `for_business` for business-scoped queries and `scatter` for
+    queries that must run on every shard.
+    """
+
+    def __init__(self):
+        self._sessions = [None] * SHARD_COUNT
+
+    @property
+    def sharded(self) -> bool:
+        return SHARD_COUNT > 1
+
+    def shard(self, index: int) -> Session:
+        if self._sessions[index] is None:
+            self._sessions[index] = ReadSessionLocal(bind=shard_read_routers[index].engine())
+        return self._sessions[index]
+
+    def for_business(self, business_id: str) -> Session:
+        return self.shard(shard_index(business_id))
+
+    def scatter(self, fn: Callable[[Session], object]) -> list:
+        """Run fn(session) on every shard in parallel; results in shard order."""
+        sessions = [self.shard(i) for i in range(SHARD_COUNT)]
+        if _scatter_pool is None:
+            return [fn(session) for session in sessions]
+        return list(_scatter_pool.map(fn, sessions))
+
+    def close(self):
+        for session in self._sessions:
+            if session is not None:
+                session.close()
+
+
+def merge_by_review_date(shard_results) -> list:
+    """
+    Merge per-shard result lists that are each sorted by review_date
+    (newest first) into one list in the same order.
+    """
+    return list(iter_by_review_date(shard_results))
+
+
+def iter_by_review_date(shard_results) -> Iterator:
+    """
+    Lazy `merge_by_review_date`: rows are pulled from the per-shard
+    iterables (e.g. streamed results) only as the merged rows are consumed.
+    """
+    # Rows without a review (outer joins) sort last, as NULLs do in SQL
+    return heapq.merge(
+        *shard_results,
+        key=lambda r: (r.review_date is not None, r.review_date),
+        reverse=True,
+    )
+
+
+def get_sharded_read_session() -> ShardedSession:
+    """Open request-scoped read sessions across all shards."""
+    return ShardedSession()
@@ -0,0 +1,148 @@
+"""
+Row validation and quarantine for review ingestion.
+
+`validate_reviews` checks a whole chunk at once with vectorised pandas
+operations and splits it into clean rows and rejected rows, each rejected
+row carrying the reason(s) it failed:
+- required fields present and non-blank
+- review_date parseable
+- rating numeric, whole and between 1 and 5
+- review_ip_address a valid IPv4 / IPv6 address
+
+Rejected rows are appended to the quarantined_reviews table (raw values,
+source file, row number, reason) instead of failing the load. Like
+staging_reviews, the table is not part of Base.metadata, so it survives
+setup_db and can be inspected and replayed after a load.
+"""
+
+import ipaddress
+from datetime import datetime, timezone
+from functools import lru_cache
+
+import pandas as pd
+from sqlalchemy import Table, Column, String, Integer, DateTime, MetaData
+from sqlalchemy.exc import SQLAlchemyError
+
+REQUIRED_FIELDS = [
+    "review_id",
+    "reviewer_id",
+    "reviewer_name",
+    "email_address",
+    "reviewer_country",
+    "business_id",
+    "business_name",
+    "review_title",
+    "content",
+    "review_ip_address",
+]
+
+# Source columns kept verbatim (as text) in quarantine
+RAW_FIELDS = REQUIRED_FIELDS + ["rating", "review_date"]
+
+# Errors that fail a batch write: DataFrame.to_sql wraps database errors
+# in pandas' DatabaseError rather than re-raising SQLAlchemy's
+LOAD_ERRORS = (SQLAlchemyError, pd.errors.DatabaseError)
+
+quarantine_metadata = MetaData()
+
+quarantine = Table(
+    "quarantined_reviews",
+    quarantine_metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("source_file", String),
+    Column("row_number", Integer),
+    Column("reason", String, nullable=False),
+    Column("quarantined_at", DateTime(timezone=True), nullable=False),
+    *[Column(field, String) for field in RAW_FIELDS],
+)
+
+
+def parse_review_dates(values: pd.Series) -> pd.Series:
+    """
+    Parse review dates as UTC timestamps; unparseable values become NaT.
+
+    Every value is parsed as ISO 8601 on its own, so the result does not
+    depend on which format happens to open a chunk.
+    """
+    return pd.to_datetime(values, errors="coerce", utc=True, format="ISO8601")
+
+
+@lru_cache(maxsize=65536)
+def _is_ip_address(value: str) -> bool:
+    try:
+        ipaddress.ip_address(value)
+    except ValueError:
+        return False
+    return True
+
+
+def validate_reviews(df: pd.DataFrame):
+    """
+    Split a staging-shaped chunk into (clean rows, rejected rows).
+
+    The rejected frame has the original columns plus `reason`, a
+    '; '-separated list of every check the row failed.
+    """
+    reasons = pd.Series("", index=df.index, dtype=object)
+
+    def flag(failed: pd.Series, reason: str):
+        nonlocal reasons
+        reasons = reasons.where(~failed, reasons + reason + "; ")
+
+    # Required fields
+    for field in REQUIRED_FIELDS:
+        values = df[field]
+        blank = values.isna() | values.astype(str).str.strip().eq("")
+        flag(blank, f"missing {field}")
+
+    # Dates
+    flag(parse_review_dates(df["review_date"]).isna(), "invalid review_date")
+
+    # Ratings
+    ratings = pd.to_numeric(df["rating"], errors="coerce")
+    flag(
+        ratings.isna() | (ratings % 1 != 0) | ~ratings.between(1, 5),
+        "invalid rating",
+    )
+
+    # IP addresses (blank ones are already reported as missing)
+    ips = df["review_ip_address"].astype(object).where(df["review_ip_address"].notna(), "")
+    ips = ips.astype(str).str.strip()
+    valid_ip = ips.map(_is_ip_address).astype(bool)
+    flag(ips.ne("") & ~valid_ip, "invalid review_ip_address")
+
+    failed = reasons.ne("")
+    rejected = df[failed].assign(reason=reasons[failed].str.rstrip("; "))
+
+    return df[~failed], rejected
+
+
+def write_quarantine(conn, rejected: pd.DataFrame, source_file: str) -> int:
+    """
+    Append rejected rows to quarantined_reviews.
+
+    The frame's index is taken as the 0-based data row number in the
+    source file. Returns the number of rows quarantined.
+    """
+    if rejected.empty:
+        return 0
+
+    records = rejected[RAW_FIELDS].astype(object)
+    records = records.where(records.notna(), None).map(
+        lambda v: None if v is None else str(v)
+    )
+    records = records.assign(
+        source_file=source_file,
+        row_number=[int(i) + 1 for i in rejected.index],
+        reason=rejected["reason"],
+        quarantined_at=datetime.now(timezone.utc),
+    )
+
+    conn.execute(quarantine.insert(), records.to_dict(orient="records"))
+    return len(records)
+
+
+def failed_batch(rows: pd.DataFrame, exc: Exception) -> pd.DataFrame:
+    """Rows of a batch whose write failed, with the error as their reason."""
+    message = str(exc).strip().splitlines()[0] if str(exc).strip() else ""
+    return rows.assign(reason=f"batch load failed: {type(exc).__name__}: {message}")
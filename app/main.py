@@ -4,6 +4,7 @@ Main entry point for the FastAPI application.
 Responsibilities:
 - Create the FastAPI app instance
 - Register API routers
+- Apply admission control (per-lane concurrency limits)
 - Provide a clean, minimal startup surface
 """
 
@@ -14,6 +15,8 @@ from app.api.reviews import router as reviews_router
 from app.api.users import router as users_router
 from app.api.system import router as system_router   # NEW (health + stats)
 from app.api.businesses import router as businesses_router  # if you have it
+from app.api.reports import router as reports_router  # rollup-backed aggregates
+from app.services.admission import AdmissionMiddleware, admission
 
 # Create the FastAPI application instance
 app = FastAPI(
@@ -32,9 +35,13 @@ app = FastAPI(
     ]
 )
 
+# Bound concurrent exports / lookups; shed excess load with 503 + Retry-After
+app.add_middleware(AdmissionMiddleware, controller=admission)
+
 # Register API routers
 app.include_router(reviews_router, prefix="/reviews")
 app.include_router(users_router, prefix="/users")
-app.include_router(system_router)  # /health, /stats
+app.include_router(system_router)  # /health, /stats, /admission
 app.include_router(businesses_router, prefix="/businesses")  # optional
+app.include_router(reports_router, prefix="/reports")  # /reports/aggregates
 
@@ -0,0 +1,186 @@
+"""
+Admission control for the API.
+
+Every route belongs to a lane:
+- export: requests whose cost grows with the data: CSV exports (reviews
+  by business / user, the /reviews/ report, subject-access exports), the
+  full /businesses/ list and the /stats table counts
+- lookup: cheap, bounded lookups (user account, rollup aggregates)
+- unmanaged: /health, /admission and the docs, which always get through
+
+Each lane has its own concurrency limit and a bounded wait queue. When a
+lane's queue is full, or a request waits longer than the queue timeout, the
+request is rejected straight away with 503 and a Retry-After header instead
+of tying up a worker thread and a database connection. A burst of exports
+therefore cannot starve lookups or health checks.
+
+Limits (environment variables, defaults in brackets):
+- ADMISSION_EXPORT_CONCURRENCY [4], ADMISSION_EXPORT_QUEUE [16]
+- ADMISSION_LOOKUP_CONCURRENCY [8], ADMISSION_LOOKUP_QUEUE [64]
+- ADMISSION_QUEUE_TIMEOUT_SECONDS [10]
+
+Keep the sum of the concurrency limits below both the worker thread pool
+(40 threads by default) and the database connection pool.
+"""
+
+import os
+import re
+import time
+import asyncio
+from typing import Optional
+
+from fastapi.responses import JSONResponse
+
+# (path pattern, lane); first match wins, unmatched paths are unmanaged
+ROUTE_LANES = [
+    (re.compile(r"^/reviews(/.*)?$"), "export"),
+    (re.compile(r"^/users/[^/]+/subject-access$"), "export"),
+    (re.compile(r"^/businesses(/.*)?$"), "export"),
+    (re.compile(r"^/stats$"), "export"),
+    (re.compile(r"^/users/"), "lookup"),
+    (re.compile(r"^/reports/"), "lookup"),
+]
+
+
+class Lane:
+    """A concurrency limit with a bounded FIFO wait queue."""
+
+    def __init__(self, name: str, limit: int, queue_size: int,
+                 queue_timeout: float, retry_after: int):
+        self.name = name
+        self.limit = limit
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+
+        self._semaphore = asyncio.Semaphore(limit)
+
+        # Metrics
+        self.in_flight = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    async def acquire(self) -> bool:
+        """Wait for a slot; return False if the request must be rejected."""
+        started = time.monotonic()
+
+        if self._semaphore.locked():
+            if self.waiting >= self.queue_size:
+                self.rejected += 1
+                return False
+
+            self.waiting += 1
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), self.queue_timeout)
+            except asyncio.TimeoutError:
+                self.rejected += 1
+                return False
+            finally:
+                self.waiting -= 1
+        else:
+            # A free slot is taken without suspending
+            await self._semaphore.acquire()
+
+        waited = time.monotonic() - started
+        self.in_flight += 1
+        self.admitted += 1
+        self.total_wait_seconds += waited
+        self.max_wait_seconds = max(self.max_wait_seconds, waited)
+        return True
+
+    def release(self):
+        self.in_flight -= 1
+        self._semaphore.release()
+
+    def stats(self) -> dict:
+        return {
+            "limit": self.limit,
+            "queue_size": self.queue_size,
+            "in_flight": self.in_flight,
+            "queue_depth": self.waiting,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "avg_wait_ms": round(1000 * self.total_wait_seconds / self.admitted, 2)
+            if self.admitted else 0.0,
+            "max_wait_ms": round(1000 * self.max_wait_seconds, 2),
+        }
+
+
+class AdmissionController:
+    """Maps request paths to lanes."""
+
+    def __init__(self, lanes: dict):
+        self.lanes = lanes
+
+    @classmethod
+    def from_env(cls) -> "AdmissionController":
+        timeout = float(os.getenv("ADMISSION_QUEUE_TIMEOUT_SECONDS", "10"))
+        return cls({
+            "export": Lane(
+                "export",
+                limit=int(os.getenv("ADMISSION_EXPORT_CONCURRENCY", "4")),
+                queue_size=int(os.getenv("ADMISSION_EXPORT_QUEUE", "16")),
+                queue_timeout=timeout,
+                retry_after=30,
+            ),
+            "lookup": Lane(
+                "lookup",
+                limit=int(os.getenv("ADMISSION_LOOKUP_CONCURRENCY", "8")),
+                queue_size=int(os.getenv("ADMISSION_LOOKUP_QUEUE", "64")),
+                queue_timeout=timeout,
+                retry_after=1,
+            ),
+        })
+
+    def lane_for(self, path: str) -> Optional[Lane]:
+        for pattern, lane in ROUTE_LANES:
+            if pattern.match(path):
+                return self.lanes[lane]
+        return None
+
+    def stats(self) -> dict:
+        return {name: lane.stats() for name, lane in self.lanes.items()}
+
+
+class AdmissionMiddleware:
+    """
+    ASGI middleware applying admission control.
+
+    The lane slot is held until the response body has been sent, so
+    streamed exports count against their lane for their full duration.
+    """
+
+    def __init__(self, app, controller: AdmissionController):
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        lane = self.controller.lane_for(scope["path"])
+        if lane is None:
+            await self.app(scope, receive, send)
+            return
+
+        if not await lane.acquire():
+            response = JSONResponse(
+                status_code=503,
+                content={"detail": f"Server busy ({lane.name} requests). Retry later."},
+                headers={"Retry-After": str(lane.retry_after)},
+            )
+            await response(scope, receive, send)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            lane.release()
+
+
+# Process-wide controller used by app.main and the /admission endpoint
+admission = AdmissionController.from_env()
@@ -7,12 +7,18 @@ results into a downloadable CSV file. It supports:
 - SQLAlchemy Row objects
 - Tuples or lists
 
+It can also stream several tables as one multi-section CSV, reading the
+rows as they are sent.
+
 Keeping this logic in one place avoids duplication across API endpoints.
 """
 
 import csv
 from io import StringIO
-from fastapi.responses import Response
+from fastapi.responses import Response, StreamingResponse
+
+# Rows rendered per piece of a streamed response
+STREAM_CHUNK_ROWS = 1000
 
 
 def generate_csv_response(rows, headers, filename: str) -> Response:
@@ -39,26 +45,72 @@ def generate_csv_response(rows, headers, filename: str) -> Response:
 
     # Write each row of data
     for row in rows:
+        writer.writerow(_row_values(row, headers))
 
-        # Case 1: SQLAlchemy Row object (row._mapping)
-        if hasattr(row, "_mapping"):
-            writer.writerow([row._mapping[h] for h in headers])
+    # Return the CSV as an HTTP response with download headers
+    return Response(
+        content=buffer.getvalue(),
+        media_type="text/csv",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
 
-        # Case 2: ORM object (attributes)
-        elif hasattr(row, "__dict__"):
-            writer.writerow([getattr(row, h) for h in headers])
 
-        # Case 3: Tuple or list
-        elif isinstance(row, (tuple, list)):
-            writer.writerow(list(row))
+def generate_csv_sections_response(sections, filename: str) -> StreamingResponse:
+    """
+    Stream several CSV tables as one multi-section download.
 
-        # Fallback: convert unknown types to string
-        else:
-            writer.writerow([str(row)])
+    Each section is written as a "# <title>" line, its header row, its
+    rows and a blank separator line. Rows are rendered and sent
+    STREAM_CHUNK_ROWS at a time, so a section's rows can be a lazy iterator
+    (e.g. a streamed query result) that is only read while sending.
 
-    # Return the CSV as an HTTP response with download headers
-    return Response(
-        content=buffer.getvalue(),
+    Args:
+        sections: Iterable of (title, headers, rows) tuples; rows may be
+            any iterable
+        filename: Name of the CSV file returned to the caller
+
+    Returns:
+        FastAPI StreamingResponse containing the CSV sections
+    """
+
+    def render():
+        for title, headers, rows in sections:
+            buffer = StringIO()
+            writer = csv.writer(buffer)
+
+            writer.writerow([f"# {title}"])
+            writer.writerow(headers)
+            for count, row in enumerate(rows, start=1):
+                writer.writerow(_row_values(row, headers))
+                if count % STREAM_CHUNK_ROWS == 0:
+                    yield buffer.getvalue()
+                    buffer.seek(0)
+                    buffer.truncate()
+            writer.writerow([])
+
+            yield buffer.getvalue()
+
+    return StreamingResponse(
+        render(),
         media_type="text/csv",
         headers={"Content-Disposition": f'attachment; filename="{filename}"'},
     )
+
+
+def _row_values(row, headers):
+    """Extract the values of one row, in header order."""
+
+    # Case 1: SQLAlchemy Row object (row._mapping)
+    if hasattr(row, "_mapping"):
+        return [row._mapping[h] for h in headers]
+
+    # Case 2: ORM object (attributes)
+    if hasattr(row, "__dict__"):
+        return [getattr(row, h) for h in headers]
+
+    # Case 3: Tuple or list
+    if isinstance(row, (tuple, list)):
+        return list(row)
+
+    # Fallback: convert unknown types to string
+    return [str(row)]
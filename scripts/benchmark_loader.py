@@ -0,0 +1,90 @@
+"""
+Compare the staging loaders on the same input.
+
+Runs `ingest_raw_reviews` (DataFrame.to_sql) and `load_staging_native`
+against a scratch database, dropping staging_reviews before every run,
+and reports the best wall-clock time of each and the speedup. The run
+fails if the loaders do not stage the same rows (compared by
+content_fingerprint, duplicates included).
+
+Usage:
+      python -m scripts.benchmark_loader [csv_path] [--database-url URL]
+
+Without --database-url a temporary SQLite file is used. The target's
+staging_reviews table is DROPPED, so never point this at a live database.
+"""
+
+import sys
+import os
+import time
+import argparse
+import tempfile
+import contextlib
+
+from sqlalchemy import create_engine, text
+
+# Ensure project root is on the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.ingest_reviews import CSV_PATH, staging, ingest_raw_reviews
+from scripts.bulk_load import load_staging_native
+
+
+def _time_loader(engine, load, repeat):
+    """Return (best seconds, sorted staged fingerprints) over `repeat` clean runs."""
+    best = float("inf")
+    rows = []
+    for _ in range(repeat):
+        staging.drop(engine, checkfirst=True)
+        with open(os.devnull, "w") as sink, contextlib.redirect_stdout(sink):
+            started = time.perf_counter()
+            load(engine)
+            elapsed = time.perf_counter() - started
+        best = min(best, elapsed)
+        with engine.connect() as conn:
+            rows = sorted(conn.execute(
+                text("SELECT content_fingerprint FROM staging_reviews")
+            ).scalars())
+    return best, rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("csv_path", nargs="?", default=CSV_PATH)
+    parser.add_argument("--database-url", default=None, help="Scratch database URL.")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = args.database_url or f"sqlite:///{os.path.join(tmp, 'benchmark.db')}"
+        engine = create_engine(url)
+
+        baseline, baseline_rows = _time_loader(
+            engine, lambda e: ingest_raw_reviews(e, args.csv_path), args.repeat
+        )
+        native, native_rows = _time_loader(
+            engine,
+            lambda e: load_staging_native(e, args.csv_path, workers=args.workers),
+            args.repeat,
+        )
+        staging.drop(engine, checkfirst=True)
+        engine.dispose()
+
+    if len(baseline_rows) != len(native_rows):
+        raise RuntimeError(
+            f"Loaders disagree: to_sql loaded {len(baseline_rows)} rows, "
+            f"native loaded {len(native_rows)}"
+        )
+    if baseline_rows != native_rows:
+        raise RuntimeError("Loaders disagree: staged rows differ (content_fingerprint)")
+
+    print(f"Database:        {engine.dialect.name}")
+    print(f"Rows:            {len(native_rows)}")
+    print(f"to_sql (best):   {baseline:.3f}s")
+    print(f"native (best):   {native:.3f}s")
+    print(f"Speedup:         {baseline / native:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+"""
+Native bulk loader for the staging table.
+
+This is an alternative to `ingest_raw_reviews` (which goes through
+`DataFrame.to_sql`). It:
+- Splits the CSV into record-aligned text shards
+- Parses and type-converts the shards in a process pool
+- Streams each shard into staging_reviews using the fastest path the
+  database offers:
+    * PostgreSQL: COPY ... FROM STDIN
+    * SQLite:     DBAPI executemany
+    * Others:     SQLAlchemy Core executemany
+- Quarantines rows that fail validation (see app/db/validation.py)
+- Commits every shard in its own transaction; a shard that fails to
+  write is rolled back and quarantined as a whole, and loading continues
+
+Select it with:
+      python -m scripts.setup_db --loader native
+"""
+
+import sys
+import os
+import io
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+# Ensure project root is on the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.ingest_reviews import (
+    CSV_PATH,
+    STAGING_COLUMNS,
+    staging,
+    ensure_staging_table,
+    prepare_staging_frame,
+)
+from app.db.validation import LOAD_ERRORS, failed_batch, quarantine_metadata, write_quarantine
+
+# Rows per shard handed to a worker process
+SHARD_ROWS = 20_000
+
+
+def split_csv_shards(csv_path, shard_rows=SHARD_ROWS):
+    """
+    Yield (header, body, first_row) text shards of at most `shard_rows`
+    records; first_row is the 0-based data row the shard starts at.
+
+    Shards are only cut on record boundaries: a line break inside a quoted
+    field (e.g. multi-line review content) leaves an odd number of quote
+    characters open, so the shard is extended until the quote closes.
+    """
+    with open(csv_path, newline="", encoding="utf-8") as fh:
+        header = fh.readline()
+
+        lines = []
+        records = 0
+        first_row = 0
+        in_quotes = False
+
+        for line in fh:
+            lines.append(line)
+            if line.count('"') % 2:
+                in_quotes = not in_quotes
+            if in_quotes:
+                continue
+
+            records += 1
+            if records >= shard_rows:
+                yield header, "".join(lines), first_row
+                first_row += records
+                lines = []
+                records = 0
+
+        if lines:
+            yield header, "".join(lines), first_row
+
+
+def _parse_shard(shard):
+    """Worker: parse one text shard into (clean staging rows, rejected rows)."""
+    header, body, first_row = shard
+    df = pd.read_csv(io.StringIO(header + body), dtype=str)
+    df.index = pd.RangeIndex(first_row, first_row + len(df))
+    return prepare_staging_frame(df)
+
+
+def parse_shards(csv_path, workers=None, shard_rows=SHARD_ROWS):
+    """
+    Yield parsed (clean, rejected) shards in file order.
+
+    At most `2 * workers` shards are in flight, so memory stays bounded
+    regardless of file size.
+    """
+    workers = workers or os.cpu_count() or 1
+    shards = split_csv_shards(csv_path, shard_rows)
+
+    if workers == 1:
+        for shard in shards:
+            yield _parse_shard(shard)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for shard in shards:
+            pending.append(pool.submit(_parse_shard, shard))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _to_records(df):
+    """Convert a parsed shard into DBAPI-ready tuples (None for nulls)."""
+    frame = df.astype(object).where(df.notna(), None)
+    frame["review_date"] = frame["review_date"].map(
+        lambda d: d.isoformat() if d is not None else None
+    )
+    return list(frame.itertuples(index=False, name=None))
+
+
+def _copy_shard(conn, df):
+    """PostgreSQL: stream the shard through COPY ... FROM STDIN."""
+    buffer = io.StringIO()
+    df.to_csv(buffer, index=False, header=False)
+    buffer.seek(0)
+
+    cursor = conn.connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY staging_reviews ({', '.join(STAGING_COLUMNS)}) "
+            "FROM STDIN WITH (FORMAT csv)",
+            buffer,
+        )
+    finally:
+        cursor.close()
+
+
+def _executemany_shard(conn, df):
+    """SQLite: one prepared INSERT executed for every row in the shard."""
+    placeholders = ", ".join("?" for _ in STAGING_COLUMNS)
+    cursor = conn.connection.cursor()
+    try:
+        cursor.executemany(
+            f"INSERT INTO staging_reviews ({', '.join(STAGING_COLUMNS)}) "
+            f"VALUES ({placeholders})",
+            _to_records(df),
+        )
+    finally:
+        cursor.close()
+
+
+def _core_shard(conn, df):
+    """Any other dialect: SQLAlchemy Core executemany."""
+    conn.execute(
+        staging.insert(),
+        [dict(zip(STAGING_COLUMNS, row)) for row in _to_records(df)],
+    )
+
+
+def load_staging_native(engine, csv_path=CSV_PATH, workers=None, shard_rows=SHARD_ROWS):
+    """Load the raw CSV into staging_reviews with the native bulk path."""
+    ensure_staging_table(engine)
+    quarantine_metadata.create_all(engine)
+
+    if engine.dialect.name == "postgresql":
+        write_shard = _copy_shard
+    elif engine.dialect.name == "sqlite":
+        write_shard = _executemany_shard
+    else:
+        write_shard = _core_shard
+
+    # COPY / executemany run on the raw DBAPI cursor, whose errors are not
+    # wrapped by SQLAlchemy
+    load_errors = LOAD_ERRORS + (engine.dialect.loaded_dbapi.Error,)
+
+    total = quarantined = failed = 0
+    for df, rejected in parse_shards(csv_path, workers, shard_rows):
+        try:
+            with engine.begin() as conn:
+                shard_quarantined = write_quarantine(conn, rejected, csv_path)
+                write_shard(conn, df)
+
+        except load_errors as exc:
+            failed += 1
+            print(f"Error during native staging load, shard quarantined: {exc}")
+
+            # Workers only return the parsed rows, so the failed shard is
+            # quarantined with its validated values
+            with engine.begin() as conn:
+                quarantined += write_quarantine(conn, rejected, csv_path)
+                quarantined += write_quarantine(conn, failed_batch(df, exc), csv_path)
+            continue
+
+        quarantined += shard_quarantined
+        total += len(df)
+
+    print(
+        f"Staging ingestion complete (native loader, {total} rows, "
+        f"{quarantined} quarantined, {failed} failed shards)."
+    )
+    return total
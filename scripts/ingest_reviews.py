@@ -1,64 +1,160 @@
 import sys
 import os
 import pandas as pd
-from sqlalchemy import Table, Column, String, Integer, MetaData, Date
+from sqlalchemy import Table, Column, String, Integer, MetaData, Date, inspect, text
 
 # Ensure project root is on the Python path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-def ingest_raw_reviews(engine):
-    metadata = MetaData()
-
-    staging = Table(
-        "staging_reviews",
-        metadata,
-        Column("review_id", String),
-        Column("reviewer_id", String),
-        Column("reviewer_name", String),
-        Column("email_address", String),
-        Column("reviewer_country", String),
-        Column("business_id", String),
-        Column("business_name", String),
-        Column("business_category", String),
-        Column("review_title", String),
-        Column("content", String),
-        Column("rating", Integer),
-        Column("review_date", Date),
-        Column("review_ip_address", String),
-    )
+from app.db.fingerprint import FINGERPRINT_LENGTH, content_fingerprints
+from app.db.validation import (
+    LOAD_ERRORS,
+    failed_batch,
+    parse_review_dates,
+    quarantine_metadata,
+    validate_reviews,
+    write_quarantine,
+)
 
-    metadata.create_all(engine)
+# Default location of the raw export
+CSV_PATH = "data/trustpilot_reviews.csv"
+
+# CSV rows per independently committed chunk
+CHUNK_ROWS = 50_000
+
+# Raw CSV header -> staging column
+COLUMN_MAP = {
+    "Review Id": "review_id",
+    "Reviewer Name": "reviewer_name",
+    "Review Title": "review_title",
+    "Review Rating": "rating",
+    "Review Content": "content",
+    "Review IP Address": "review_ip_address",
+    "Business Id": "business_id",
+    "Business Name": "business_name",
+    "Reviewer Id": "reviewer_id",
+    "Email Address": "email_address",
+    "Reviewer Country": "reviewer_country",
+    "Review Date": "review_date",
+}
+
+metadata = MetaData()
+
+staging = Table(
+    "staging_reviews",
+    metadata,
+    Column("review_id", String),
+    Column("reviewer_id", String),
+    Column("reviewer_name", String),
+    Column("email_address", String),
+    Column("reviewer_country", String),
+    Column("business_id", String),
+    Column("business_name", String),
+    Column("business_category", String),
+    Column("review_title", String),
+    Column("content", String),
+    Column("rating", Integer),
+    Column("review_date", Date),
+    Column("review_ip_address", String),
+    Column("content_fingerprint", String(FINGERPRINT_LENGTH), index=True),
+)
+
+STAGING_COLUMNS = [c.name for c in staging.columns]
 
-    # Load CSV
-    df = pd.read_csv("data/trustpilot_reviews.csv")
+
+def prepare_staging_frame(df):
+    """
+    Map a raw CSV frame onto the staging_reviews layout.
+
+    Returns (clean rows, rejected rows): rows failing validation are split
+    off with a `reason` column instead of being coerced into staging.
+    """
 
     # Rename columns
-    df = df.rename(columns={
-        "Review Id": "review_id",
-        "Reviewer Name": "reviewer_name",
-        "Review Title": "review_title",
-        "Review Rating": "rating",
-        "Review Content": "content",
-        "Review IP Address": "review_ip_address",
-        "Business Id": "business_id",
-        "Business Name": "business_name",
-        "Reviewer Id": "reviewer_id",
-        "Email Address": "email_address",
-        "Reviewer Country": "reviewer_country",
-        "Review Date": "review_date",
-    })
+    df = df.rename(columns=COLUMN_MAP)
+
+    # Validate before any type conversion, so rejects keep their raw values
+    df, rejected = validate_reviews(df)
+    df = df.copy()
 
     # Add missing column
     df["business_category"] = None
 
-    # Convert Review Date safely
-    df["review_date"] = pd.to_datetime(
-        df["review_date"],
-        errors="coerce",
-        utc=True
-    ).dt.tz_localize(None).dt.date
+    # Convert Review Date and Rating (both validated above)
+    df["review_date"] = parse_review_dates(df["review_date"]).dt.tz_localize(None).dt.date
+    df["rating"] = pd.to_numeric(df["rating"]).astype(int)
+
+    # Fingerprint used for deduplication during normalisation
+    df["content_fingerprint"] = content_fingerprints(df)
 
-    # Write to staging table
-    df.to_sql("staging_reviews", engine, if_exists="append", index=False)
+    return df[STAGING_COLUMNS], rejected
 
-    print("Staging ingestion complete.")
+
+def ensure_staging_table(engine):
+    """
+    Create staging_reviews, or add the fingerprint column to a staging
+    table created before fingerprints existed.
+
+    staging_reviews is append-only and survives setup_db, so older
+    databases may still have the original layout. Rows loaded before the
+    upgrade keep a NULL fingerprint, which normalisation computes on read.
+    """
+    metadata.create_all(engine)
+
+    columns = {c["name"] for c in inspect(engine).get_columns("staging_reviews")}
+    if "content_fingerprint" in columns:
+        return
+
+    with engine.begin() as conn:
+        conn.execute(text(
+            "ALTER TABLE staging_reviews "
+            f"ADD COLUMN content_fingerprint VARCHAR({FINGERPRINT_LENGTH})"
+        ))
+        for index in staging.indexes:
+            index.create(conn, checkfirst=True)
+
+
+def ingest_raw_reviews(engine, csv_path=CSV_PATH, chunksize=CHUNK_ROWS):
+    """
+    Load the raw CSV into staging_reviews in independently committed chunks.
+
+    Rows that fail validation go to quarantined_reviews; the rest of the
+    chunk is still loaded, so one malformed line no longer fails the file.
+    A chunk that fails to write is rolled back and quarantined as a whole,
+    and loading continues with the next one.
+    """
+    ensure_staging_table(engine)
+    quarantine_metadata.create_all(engine)
+
+    loaded = quarantined = failed = 0
+
+    # Load CSV (as text, so quarantined rows keep their raw values)
+    for chunk in pd.read_csv(csv_path, dtype=str, chunksize=chunksize):
+        df, rejected = prepare_staging_frame(chunk)
+
+        # Write to staging table
+        try:
+            with engine.begin() as conn:
+                chunk_quarantined = write_quarantine(conn, rejected, csv_path)
+                df.to_sql("staging_reviews", conn, if_exists="append", index=False)
+
+        except LOAD_ERRORS as exc:
+            failed += 1
+            print(f"Error during staging ingestion, chunk quarantined: {exc}")
+
+            with engine.begin() as conn:
+                quarantined += write_quarantine(conn, rejected, csv_path)
+                quarantined += write_quarantine(
+                    conn,
+                    failed_batch(chunk.loc[df.index].rename(columns=COLUMN_MAP), exc),
+                    csv_path,
+                )
+            continue
+
+        quarantined += chunk_quarantined
+        loaded += len(df)
+
+    print(
+        f"Staging ingestion complete ({loaded} rows, {quarantined} quarantined, "
+        f"{failed} failed chunks)."
+    )
@@ -1,45 +1,357 @@
 import sys
 import os
+from contextlib import ExitStack
+
 import pandas as pd
+from sqlalchemy import inspect, select, text
 
 # Ensure project root is on the Python path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from app.db.fingerprint import FINGERPRINT_LENGTH, content_fingerprints
+from app.db.rollups import apply_rollup_deltas
+from app.db.partitions import list_partitions, partition_name, review_source, write_reviews
+from app.db.models import Review
+from app.db.sharding import shard_engines, shard_index, unique_engines
+from app.db.validation import (
+    LOAD_ERRORS,
+    failed_batch,
+    parse_review_dates,
+    quarantine_metadata,
+    validate_reviews,
+    write_quarantine,
+)
+
+# Staging rows read per chunk
+CHUNK_ROWS = 50_000
+
+USER_COLUMNS = ["reviewer_id", "reviewer_name", "email_address", "reviewer_country"]
+BUSINESS_COLUMNS = ["business_id", "business_name"]
+REVIEW_COLUMNS = [
+    "review_id",
+    "reviewer_id",
+    "business_id",
+    "review_title",
+    "content",
+    "rating",
+    "review_date",
+    "review_ip_address",
+    "content_fingerprint",
+]
+
+
+def ensure_review_fingerprints(engine, chunksize=CHUNK_ROWS):
+    """
+    Add and backfill content_fingerprint on reviews tables created before
+    fingerprints existed (the flat `reviews` table and any month tables).
+
+    Existing rows are fingerprinted exactly as staging rows are (review_date
+    as a UTC calendar date), so reloading a file that was loaded before the
+    upgrade is still recognised as a duplicate. Safe to run repeatedly.
+    """
+    with engine.begin() as conn:
+        tables = [Review.__tablename__] + [partition_name(m) for m in list_partitions(conn)]
+
+        for table in tables:
+            columns = {c["name"] for c in inspect(conn).get_columns(table)}
+            if "content_fingerprint" not in columns:
+                conn.execute(text(
+                    f"ALTER TABLE {table} "
+                    f"ADD COLUMN content_fingerprint VARCHAR({FINGERPRINT_LENGTH})"
+                ))
+                conn.execute(text(
+                    f"CREATE INDEX IF NOT EXISTS ix_{table}_content_fingerprint "
+                    f"ON {table} (content_fingerprint)"
+                ))
+
+            # Every pass fingerprints the rows it reads, so this terminates
+            while True:
+                rows = pd.read_sql(
+                    text(
+                        "SELECT review_id, reviewer_id, business_id, review_date, content "
+                        f"FROM {table} WHERE content_fingerprint IS NULL LIMIT {int(chunksize)}"
+                    ),
+                    conn,
+                )
+                if rows.empty:
+                    break
+
+                keyed = rows.assign(
+                    review_date=parse_review_dates(rows["review_date"])
+                    .dt.tz_localize(None).dt.date
+                )
+                updated = conn.execute(
+                    text(
+                        f"UPDATE {table} SET content_fingerprint = :fingerprint "
+                        "WHERE review_id = :review_id AND review_date = :review_date"
+                    ),
+                    [
+                        {"fingerprint": f, "review_id": r, "review_date": d}
+                        for f, r, d in zip(
+                            content_fingerprints(keyed), rows["review_id"], rows["review_date"]
+                        )
+                    ],
+                ).rowcount
+                if updated == 0:
+                    raise RuntimeError(f"Could not backfill content_fingerprint on {table}")
+
+
+def _existing_keys(conn, query):
+    """Load one key column into a set (used to seed deduplication)."""
+    if isinstance(query, str):
+        query = text(query)
+    return {row[0] for row in conn.execute(query) if row[0] is not None}
+
+
+class ReviewNormaliser:
+    """
+    Deduplicate staged rows and write them to users, businesses, reviews
+    and the rollups, routing every row to its business's shard.
+
+    Holds the deduplication state for one load, seeded from what the
+    shards already contain:
+    - fingerprints of existing reviews (one 32-character digest each)
+    - review_ids of existing reviews
+    - reviewer_id -> country for users already stored
+    - which users / businesses each shard already has
+
+    The state only grows as chunks are loaded; if a chunk's transaction is
+    rolled back, build a new normaliser to reseed it.
+
+    Args:
+        shard_conns: One open connection per shard, in shard order, used
+            to seed the state
+    """
+
+    def __init__(self, shard_conns):
+        self.seen_reviews = set()
+        self.seen_review_ids = set()
+        self.user_countries = {}
+        self.seen_businesses = set()
+        self.shard_users = []
+
+        for conn in shard_conns:
+            source = review_source(conn)
+            self.seen_reviews |= _existing_keys(conn, select(source.c.content_fingerprint))
+            self.seen_review_ids |= _existing_keys(conn, select(source.c.review_id))
+            shard_countries = dict(
+                conn.execute(text("SELECT reviewer_id, reviewer_country FROM users")).all()
+            )
+            for reviewer_id, country in shard_countries.items():
+                self.user_countries.setdefault(reviewer_id, country)
+            self.shard_users.append(set(shard_countries))
+            self.seen_businesses |= _existing_keys(conn, "SELECT business_id FROM businesses")
+
+    def load(self, shard_conns, df):
+        """
+        Write one chunk of validated staging rows through `shard_conns`.
+
+        Returns (number of new reviews, conflicting rows). Exact repeats of
+        a review are dropped; a row reusing a known review_id with other
+        content (e.g. a re-export with a corrected date) is returned with a
+        `reason` instead of being written, so the first version stays the
+        only one and review_id stays unique across partitions.
+        """
+
+        # Rows staged before fingerprints existed are fingerprinted here
+        missing = df["content_fingerprint"].isna()
+        if missing.any():
+            df.loc[missing, "content_fingerprint"] = content_fingerprints(df[missing])
+
+        # Deduplicate
+        df = df[~df["content_fingerprint"].duplicated()]
+        df = df[~df["content_fingerprint"].isin(self.seen_reviews)]
+
+        conflicting = df["review_id"].duplicated() | df["review_id"].isin(self.seen_review_ids)
+        conflicts = df[conflicting].assign(reason="duplicate review_id with different content")
+        df = df[~conflicting]
+
+        self.seen_reviews.update(df["content_fingerprint"])
+        self.seen_review_ids.update(df["review_id"])
+
+        # A user's country is fixed by the first row seen for them
+        first_seen = df.drop_duplicates(subset=["reviewer_id"])
+        first_seen = first_seen[~first_seen["reviewer_id"].isin(self.user_countries)]
+        self.user_countries.update(zip(first_seen["reviewer_id"], first_seen["reviewer_country"]))
+
+        shards = df["business_id"].map(shard_index)
+
+        for shard, part in df.groupby(shards):
+            conn = shard_conns[shard]
+            shard_users = self.shard_users[shard]
+
+            # USERS (copied to every shard holding one of their reviews)
+            users = part[USER_COLUMNS].drop_duplicates(subset=["reviewer_id"])
+            users = users[~users["reviewer_id"].isin(shard_users)]
+            users = users.assign(reviewer_country=users["reviewer_id"].map(self.user_countries))
+            shard_users.update(users["reviewer_id"])
+
+            # BUSINESSES
+            businesses = part[BUSINESS_COLUMNS].drop_duplicates(subset=["business_id"])
+            businesses = businesses[~businesses["business_id"].isin(self.seen_businesses)]
+            self.seen_businesses.update(businesses["business_id"])
 
-def normalise_reviews(engine):
-    df = pd.read_sql("SELECT * FROM staging_reviews", engine)
-
-    # Deduplicate
-    df = df.drop_duplicates(
-        subset=["review_id", "reviewer_id", "business_id", "review_date", "content"]
-    )
-
-    # USERS
-    users = df[
-        ["reviewer_id", "reviewer_name", "email_address", "reviewer_country"]
-    ].drop_duplicates()
-
-    # BUSINESSES
-    businesses = df[
-        ["business_id", "business_name"]
-    ].drop_duplicates()
-
-    # REVIEWS
-    reviews = df[
-        [
-            "review_id",
-            "reviewer_id",
-            "business_id",
-            "review_title",
-            "content",
-            "rating",
-            "review_date",
-            "review_ip_address",
+            # REVIEWS
+            reviews = part[REVIEW_COLUMNS]
+
+            users.to_sql("users", conn, if_exists="append", index=False)
+            businesses.to_sql("businesses", conn, if_exists="append", index=False)
+            write_reviews(conn, reviews)
+
+            # ROLLUPS
+            apply_rollup_deltas(
+                conn,
+                reviews.assign(reviewer_country=reviews["reviewer_id"].map(self.user_countries)),
+            )
+
+        return len(df), conflicts
+
+
+def _commit_in_order(writers):
+    """
+    Commit the chunk's connections one by one, in list order (the staging
+    database first, then the other shards in shard order).
+
+    If a commit fails, the connections before it stay committed; it and
+    the ones after it are rolled back. Returns (rolled-back connections,
+    error), or ([], None) when everything committed.
+    """
+    for position, writer in enumerate(writers):
+        try:
+            writer.commit()
+        except LOAD_ERRORS as exc:
+            lost = writers[position:]
+            for other in lost:
+                other.rollback()
+            return lost, exc
+    return [], None
+
+
+def normalise_reviews(engine, chunksize=CHUNK_ROWS):
+    """
+    Stream staging_reviews into users, businesses and reviews (written to
+    monthly partitions on each business's shard, see app/db/partitions.py
+    and app/db/sharding.py).
+
+    Deduplication runs on content fingerprints rather than the raw
+    (review_id, reviewer_id, business_id, review_date, content) fields, so
+    memory grows with the number of unique reviews (one 32-character digest
+    each), not with the size of the review text. The digest set is seeded
+    from reviews already in the database, which also drops duplicates that
+    arrived in an earlier load run. review_id must also stay unique: the
+    reviews key is (review_id, review_date), so a later row with a known
+    review_id but different content would otherwise land in a second
+    partition. Such rows are quarantined and the first version is kept.
+
+    Each chunk of new reviews is also added to the rollup tables, using
+    the reviewer's country as recorded in users.
+
+    Every chunk is committed on its own, on all shards. If a chunk fails
+    to write it is rolled back, quarantined as a whole and the next chunk
+    is loaded, so one bad row no longer undoes the whole run.
+
+    There is no transaction spanning several databases: a chunk's shards
+    are committed one after another (see `_commit_in_order`). If a commit
+    fails part-way, the shards committed before it keep their rows, and
+    only the rows routed to the shards that did not commit are quarantined.
+    """
+    quarantine_metadata.create_all(engine)
+    for shard in unique_engines(shard_engines):
+        ensure_review_fingerprints(shard)
+
+    with ExitStack() as stack:
+        conn = stack.enter_context(engine.connect())
+
+        # SQLite: a read on a second connection would block the per-chunk
+        # commits, so staging is read on the write connection (SQLite keeps
+        # the cursor open across commits). Elsewhere the server-side cursor
+        # gets its own connection, as a commit would close it.
+        if engine.dialect.name == "sqlite":
+            reader = conn
+        else:
+            reader = stack.enter_context(engine.connect())
+
+        # A shard on the ETL database shares the staging connection
+        shard_conns = [
+            conn if shard.url == engine.url else stack.enter_context(shard.connect())
+            for shard in shard_engines
         ]
-    ]
+        writers = list({id(c): c for c in [conn, *shard_conns]}.values())
+
+        normaliser = ReviewNormaliser(shard_conns)
+        quarantined = failed = offset = 0
+
+        chunks = pd.read_sql(
+            text("SELECT * FROM staging_reviews"),
+            reader.execution_options(stream_results=True),
+            chunksize=chunksize,
+        )
+
+        for df in chunks:
+            # Number rows across chunks, for the quarantine's row_number
+            df.index += offset
+            offset += len(df)
+
+            # Explicit transactions: to_sql would otherwise commit each
+            # table on its own
+            for writer in writers:
+                if not writer.in_transaction():
+                    writer.begin()
+
+            try:
+                # Staged rows from loads that predate validation are checked here
+                clean, rejected = validate_reviews(df)
+                _, conflicts = normaliser.load(shard_conns, clean)
+                chunk_quarantined = write_quarantine(conn, rejected, "staging_reviews")
+                chunk_quarantined += write_quarantine(conn, conflicts, "staging_reviews")
+
+            except LOAD_ERRORS as exc:
+                for writer in writers:
+                    writer.rollback()
+
+                failed += 1
+                print(f"Error during normalisation, chunk quarantined: {exc}")
+
+                with conn.begin():
+                    quarantined += write_quarantine(
+                        conn, failed_batch(df, exc), "staging_reviews"
+                    )
+
+                # The rolled-back chunk may have updated the dedup state
+                normaliser = ReviewNormaliser(shard_conns)
+                continue
+
+            lost, exc = _commit_in_order(writers)
+            if not lost:
+                quarantined += chunk_quarantined
+                continue
+
+            failed += 1
+            print(f"Error during normalisation, uncommitted shards quarantined: {exc}")
+
+            # Only the rows routed to a shard that did not commit are lost
+            lost_ids = {id(writer) for writer in lost}
+            on_lost_shard = clean["business_id"].map(
+                lambda business_id: id(shard_conns[shard_index(business_id)]) in lost_ids
+            )
+            lost_rows = clean[on_lost_shard & ~clean.index.isin(conflicts.index)]
+
+            with conn.begin():
+                if id(conn) in lost_ids:
+                    # The chunk's quarantine rows were rolled back with it
+                    quarantined += write_quarantine(conn, rejected, "staging_reviews")
+                    quarantined += write_quarantine(conn, conflicts, "staging_reviews")
+                else:
+                    quarantined += chunk_quarantined
+                quarantined += write_quarantine(
+                    conn, failed_batch(df.loc[lost_rows.index], exc), "staging_reviews"
+                )
+
+            normaliser = ReviewNormaliser(shard_conns)
 
-    users.to_sql("users", engine, if_exists="append", index=False)
-    businesses.to_sql("businesses", engine, if_exists="append", index=False)
-    reviews.to_sql("reviews", engine, if_exists="append", index=False)
+        for writer in writers:
+            writer.commit()
 
+    if quarantined:
+        print(f"Quarantined {quarantined} staging rows ({failed} failed chunks).")
     print("Normalisation complete.")
@@ -0,0 +1,95 @@
+"""
+Retention purge: remove one month of reviews by dropping its partition.
+
+The month's rows are also deleted from staging_reviews and
+quarantined_reviews, otherwise the next normalisation run would rebuild
+the partition from staging.
+
+Usage:
+      python -m scripts.purge_month 2023-01
+"""
+
+import sys
+import os
+from datetime import date, datetime
+
+from sqlalchemy import inspect, select
+
+# Ensure project root is on the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.session import engine
+from app.db.sharding import publish_snapshots, shard_engines
+from app.db.partitions import drop_partition, list_partitions, month_bounds, move_flat_reviews
+from app.db.validation import parse_review_dates, quarantine
+from scripts.ingest_reviews import staging
+
+
+def purge_source_rows(conn, month: str) -> int:
+    """
+    Delete the month's rows from staging_reviews and quarantined_reviews.
+
+    Quarantined dates are raw text, so they are parsed the same way as
+    during validation; rows whose date cannot be parsed have no month and
+    are left in place. Returns the number of rows deleted.
+    """
+    start, end = (date.fromisoformat(d) for d in month_bounds(month))
+    tables = inspect(conn).get_table_names()
+    deleted = 0
+
+    if staging.name in tables:
+        deleted += conn.execute(
+            staging.delete().where(
+                staging.c.review_date >= start,
+                staging.c.review_date < end,
+            )
+        ).rowcount
+
+    if quarantine.name in tables:
+        rows = conn.execute(select(quarantine.c.id, quarantine.c.review_date)).all()
+        ids = [row.id for row in rows]
+        months = parse_review_dates([row.review_date for row in rows]).strftime("%Y-%m")
+        purge_ids = [i for i, m in zip(ids, months) if m == month]
+
+        for offset in range(0, len(purge_ids), 1000):
+            deleted += conn.execute(
+                quarantine.delete().where(quarantine.c.id.in_(purge_ids[offset:offset + 1000]))
+            ).rowcount
+
+    return deleted
+
+
+def purge_month(month: str):
+    # Validate YYYY-MM before it is used in a table name
+    datetime.strptime(month, "%Y-%m")
+
+    # Source rows first, so a failed purge can never be undone by a reload
+    with engine.begin() as conn:
+        purged_source = purge_source_rows(conn, month)
+
+    purged = False
+    for shard in shard_engines:
+        with shard.begin() as conn:
+            # Rows loaded before partitioning are purged like the others
+            move_flat_reviews(conn)
+            if month not in list_partitions(conn):
+                continue
+            drop_partition(conn, month)
+            purged = True
+
+    if not purged and not purged_source:
+        print(f"No partition for {month}; nothing to purge.")
+        return
+
+    # Reports read from the snapshots, so republish them
+    publish_snapshots()
+
+    print(f"Purged reviews for {month} ({purged_source} staging / quarantined rows).")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("Usage: python -m scripts.purge_month <YYYY-MM>")
+        sys.exit(1)
+
+    purge_month(sys.argv[1])
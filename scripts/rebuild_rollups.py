@@ -0,0 +1,37 @@
+"""
+Recompute the rollup tables behind /reports/aggregates from the reviews
+already loaded, on every shard.
+
+Use it after upgrading a database that predates the rollups, or if the
+rollups are ever suspected to be out of step with the reviews.
+
+Usage:
+      python -m scripts.rebuild_rollups
+"""
+
+import sys
+import os
+
+# Ensure project root is on the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.rollups import ROLLUP_KEYS, rebuild_rollups
+from app.db.sharding import publish_snapshots, shard_engines, unique_engines
+
+
+def main():
+    total = 0
+    for shard in unique_engines(shard_engines):
+        for model in ROLLUP_KEYS:
+            model.__table__.create(shard, checkfirst=True)
+        with shard.begin() as conn:
+            total += rebuild_rollups(conn)
+
+    # Reports read from the snapshots, so republish them
+    publish_snapshots()
+
+    print(f"Rollups rebuilt from {total} reviews.")
+
+
+if __name__ == "__main__":
+    main()
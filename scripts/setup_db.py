@@ -1,26 +1,58 @@
 import sys
 import os
+import argparse
 
 # Ensure project root is on the Python path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from scripts.ingest_reviews import ingest_raw_reviews
+from scripts.bulk_load import load_staging_native
 from scripts.normalise_data import normalise_reviews
 from app.db.session import engine
 from app.db.models import Base
+from app.db.partitions import drop_all_partitions
+from app.db.sharding import publish_snapshots, shard_engines
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Build the reporting database from the raw CSV.")
+    parser.add_argument(
+        "--loader",
+        choices=["pandas", "native"],
+        default="pandas",
+        help="Staging loader: pandas (DataFrame.to_sql) or native (COPY / executemany).",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="CSV parser processes for the native loader (default: CPU count).",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
 
-
-def main():
     print("Creating tables...")
-    Base.metadata.drop_all(engine)
-    Base.metadata.create_all(engine)
+    for shard in shard_engines:
+        with shard.begin() as conn:
+            drop_all_partitions(conn)
+        Base.metadata.drop_all(shard)
+        Base.metadata.create_all(shard)
 
     print("Ingesting raw CSV into staging...")
-    ingest_raw_reviews(engine)
+    if args.loader == "native":
+        load_staging_native(engine, workers=args.workers)
+    else:
+        ingest_raw_reviews(engine)
 
     print("Normalising data...")
     normalise_reviews(engine)
 
+    for snapshot in publish_snapshots():
+        print(f"Published read-only snapshot: {snapshot}")
+
     print("Database setup complete.")
 
 
@@ -0,0 +1,33 @@
+"""Builders for review rows and raw CSV files used across the tests."""
+
+import pandas as pd
+
+from scripts.ingest_reviews import COLUMN_MAP
+
+RAW_HEADERS = {v: k for k, v in COLUMN_MAP.items()}
+
+
+def review_row(**overrides):
+    """One valid staging-shaped row (raw text values), with some fields overridden."""
+    row = {
+        "review_id": "r1",
+        "reviewer_id": "u1",
+        "reviewer_name": "Ada",
+        "email_address": "ada@example.com",
+        "reviewer_country": "UK",
+        "business_id": "b1",
+        "business_name": "Acme",
+        "review_title": "Fine",
+        "content": "Worked as expected",
+        "rating": "4",
+        "review_date": "2024-10-17",
+        "review_ip_address": "192.168.0.1",
+    }
+    row.update(overrides)
+    return row
+
+
+def write_raw_csv(path, rows):
+    """Write rows as a raw export (original CSV headers); returns the path."""
+    pd.DataFrame(rows).rename(columns=RAW_HEADERS).to_csv(path, index=False)
+    return str(path)
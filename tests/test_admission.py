@@ -0,0 +1,167 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.admission import AdmissionController, AdmissionMiddleware, Lane, admission
+
+client = TestClient(app)
+
+
+def _controller(export_limit=1, export_queue=0, lookup_limit=1, lookup_queue=0, timeout=1.0):
+    return AdmissionController({
+        "export": Lane("export", export_limit, export_queue, timeout, retry_after=30),
+        "lookup": Lane("lookup", lookup_limit, lookup_queue, timeout, retry_after=1),
+    })
+
+
+class _Backend:
+    """ASGI app that answers 200, holding requests to `held` paths until released."""
+
+    def __init__(self, held=()):
+        self.held = set(held)
+        self.release = asyncio.Event()
+        self.started = asyncio.Event()
+
+    async def __call__(self, scope, receive, send):
+        if scope["path"] in self.held:
+            self.started.set()
+            await self.release.wait()
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+
+async def _request(middleware, path):
+    """Send one GET through the middleware; return (status, headers)."""
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {"type": "http", "method": "GET", "path": path, "headers": [], "query_string": b""}
+    await middleware(scope, receive, send)
+    start = messages[0]
+    return start["status"], {k.decode(): v.decode() for k, v in start["headers"]}
+
+
+@pytest.mark.parametrize("path, lane", [
+    ("/reviews/", "export"),
+    ("/reviews/business/b1", "export"),
+    ("/users/u1/subject-access", "export"),
+    ("/businesses/", "export"),
+    ("/stats", "export"),
+    ("/users/u1", "lookup"),
+    ("/reports/aggregates", "lookup"),
+    ("/health", None),
+    ("/admission", None),
+    ("/docs", None),
+])
+def test_route_lanes(path, lane):
+    found = _controller().lane_for(path)
+    assert (found.name if found else None) == lane
+
+
+def test_full_queue_is_rejected_with_retry_after():
+    async def scenario():
+        backend = _Backend(held={"/reviews/"})
+        controller = _controller(export_limit=1, export_queue=0)
+        middleware = AdmissionMiddleware(backend, controller)
+
+        first = asyncio.create_task(_request(middleware, "/reviews/"))
+        await backend.started.wait()
+
+        rejected = await _request(middleware, "/reviews/")
+
+        backend.release.set()
+        return rejected, await first, controller.stats()["export"]
+
+    (status, headers), (first_status, _), stats = asyncio.run(scenario())
+
+    assert status == 503
+    assert headers["retry-after"] == "30"
+    assert first_status == 200
+    assert (stats["admitted"], stats["rejected"], stats["in_flight"]) == (1, 1, 0)
+
+
+def test_waiter_that_times_out_is_rejected():
+    async def scenario():
+        backend = _Backend(held={"/reviews/"})
+        controller = _controller(export_limit=1, export_queue=1, timeout=0.05)
+        middleware = AdmissionMiddleware(backend, controller)
+
+        first = asyncio.create_task(_request(middleware, "/reviews/"))
+        await backend.started.wait()
+
+        timed_out = await _request(middleware, "/reviews/")
+
+        backend.release.set()
+        await first
+        return timed_out, controller.stats()["export"]
+
+    (status, headers), stats = asyncio.run(scenario())
+
+    assert status == 503
+    assert headers["retry-after"] == "30"
+    assert (stats["rejected"], stats["queue_depth"]) == (1, 0)
+
+
+def test_exports_do_not_starve_lookups_or_health():
+    async def scenario():
+        backend = _Backend(held={"/reviews/"})
+        middleware = AdmissionMiddleware(backend, _controller(export_limit=1, export_queue=0))
+
+        export = asyncio.create_task(_request(middleware, "/reviews/"))
+        await backend.started.wait()
+
+        # The export lane is saturated; other lanes and unmanaged paths pass
+        lookup = await _request(middleware, "/users/u1")
+        health = await _request(middleware, "/health")
+        rejected_export = await _request(middleware, "/reviews/")
+
+        backend.release.set()
+        await export
+        return lookup, health, rejected_export
+
+    lookup, health, rejected_export = asyncio.run(scenario())
+
+    assert lookup[0] == 200
+    assert health[0] == 200
+    assert rejected_export[0] == 503
+
+
+def test_health_bypasses_admission_when_every_lane_is_full():
+    async def scenario():
+        backend = _Backend(held={"/reviews/", "/users/u1"})
+        middleware = AdmissionMiddleware(backend, _controller())
+
+        held = [asyncio.create_task(_request(middleware, path))
+                for path in ("/reviews/", "/users/u1")]
+        await backend.started.wait()
+
+        health = await _request(middleware, "/health")
+
+        backend.release.set()
+        await asyncio.gather(*held)
+        return health
+
+    assert asyncio.run(scenario())[0] == 200
+
+
+def test_admission_endpoint_reports_lane_metrics(fresh_db):
+    before = admission.stats()["lookup"]["admitted"]
+
+    assert client.get("/users/nobody").status_code == 404
+    response = client.get("/admission")
+
+    assert response.status_code == 200
+    stats = response.json()
+    assert set(stats) == {"export", "lookup"}
+    assert stats["lookup"]["admitted"] == before + 1
+    assert set(stats["export"]) == {
+        "limit", "queue_size", "in_flight", "queue_depth",
+        "admitted", "rejected", "avg_wait_ms", "max_wait_ms",
+    }
@@ -0,0 +1,121 @@
+import csv
+import io
+import threading
+
+from fastapi.testclient import TestClient
+
+from app.api.reviews import MAX_OFFSET
+from app.db import partitions
+from app.db.ingest import ingest_reviews
+from app.db.models import User
+from app.main import app
+from app.services import csv_export
+
+from factories import review_row, write_raw_csv
+
+client = TestClient(app)
+
+
+def test_health():
+    assert client.get("/health").status_code == 200
+
+
+def test_list_reviews_offset_is_not_capped_on_a_single_database(fresh_db):
+    # The cap only applies with several shards (see test_sharding.py)
+    response = client.get(f"/reviews/?offset={MAX_OFFSET + 1}")
+    assert response.status_code == 200
+    assert response.headers["X-Total-Count"] == "0"
+
+
+def test_list_reviews_rejects_negative_offset():
+    assert client.get("/reviews/?offset=-1").status_code == 422
+
+
+def test_sqlite_partition_is_safe_across_shard_threads():
+    name = "reviews_p1999_01"
+    barrier = threading.Barrier(8)
+    tables, errors = [], []
+
+    def resolve():
+        barrier.wait()
+        try:
+            tables.append(partitions._sqlite_partition(name))
+        except Exception as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=resolve) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    assert len({id(table) for table in tables}) == 1
+
+
+# ---------------------------------------------------------------------------
+# Subject-access export
+# ---------------------------------------------------------------------------
+def _sections(body):
+    """Split a multi-section CSV into {title: [rows after the header]}."""
+    sections, title = {}, None
+    for row in csv.reader(io.StringIO(body)):
+        if row and row[0].startswith("# "):
+            title = row[0][2:]
+            sections[title] = []
+        elif row:
+            sections[title].append(row)
+    return {name: rows[1:] for name, rows in sections.items()}
+
+
+def _load(tmp_path, rows):
+    csv_path = str(tmp_path / "reviews.csv")
+    write_raw_csv(csv_path, rows)
+    ingest_reviews(csv_path)
+
+
+def test_subject_access_streams_account_and_reviews_with_business_names(
+    fresh_db, tmp_path, monkeypatch
+):
+    _load(tmp_path, [
+        review_row(review_id="r1", review_date="2024-10-17"),
+        review_row(review_id="r2", review_date="2024-11-02", business_id="b2",
+                   business_name="Globex"),
+        review_row(review_id="r3", review_date="2024-09-01", business_id="b3",
+                   business_name="Initech"),
+        review_row(review_id="r4", reviewer_id="u2", reviewer_name="Someone Else"),
+    ])
+    # Several pieces per section
+    monkeypatch.setattr(csv_export, "STREAM_CHUNK_ROWS", 1)
+
+    response = client.get("/users/u1/subject-access")
+
+    assert response.status_code == 200
+    sections = _sections(response.text)
+    assert sections["account"] == [["u1", "Ada", "ada@example.com", "UK", "3"]]
+    assert [(r[0], r[2]) for r in sections["reviews"]] == [
+        ("r2", "Globex"),
+        ("r1", "Acme"),
+        ("r3", "Initech"),
+    ]
+
+
+def test_subject_access_for_user_without_reviews(fresh_db):
+    with fresh_db.begin() as conn:
+        conn.execute(User.__table__.insert().values(
+            reviewer_id="u9",
+            reviewer_name="No Reviews",
+            email_address="none@example.com",
+            reviewer_country="France",
+        ))
+
+    response = client.get("/users/u9/subject-access")
+
+    assert response.status_code == 200
+    sections = _sections(response.text)
+    assert sections["account"] == [["u9", "No Reviews", "none@example.com", "France", "0"]]
+    assert sections["reviews"] == []
+
+
+def test_subject_access_unknown_user_is_404(fresh_db):
+    assert client.get("/users/nobody/subject-access").status_code == 404
@@ -0,0 +1,74 @@
+import sqlite3
+
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, text
+
+from scripts import bulk_load
+from scripts.bulk_load import load_staging_native
+from scripts.ingest_reviews import STAGING_COLUMNS, ingest_raw_reviews
+
+from factories import review_row, write_raw_csv
+
+
+@pytest.fixture
+def raw_csv(tmp_path):
+    return write_raw_csv(tmp_path / "reviews.csv", [
+        review_row(review_id="r1"),
+        review_row(review_id="r2", content="Two\nlines, \"quoted\""),
+        review_row(review_id="r3", rating="9"),
+        review_row(review_id="r4", review_date="2024-10-17T23:30:00-02:00"),
+        review_row(review_id="r5", business_id="b2", business_name="Beta"),
+        review_row(review_id="r1"),
+        review_row(review_id="r6", review_ip_address="::1", rating="5.0"),
+    ])
+
+
+def _staged(engine):
+    frame = pd.read_sql("SELECT * FROM staging_reviews", engine)[STAGING_COLUMNS]
+    return frame.sort_values(["content_fingerprint", "review_id"]).reset_index(drop=True)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_native_loader_stages_same_rows_as_to_sql(tmp_path, raw_csv, workers):
+    baseline = create_engine(f"sqlite:///{tmp_path / 'to_sql.db'}")
+    native = create_engine(f"sqlite:///{tmp_path / 'native.db'}")
+
+    ingest_raw_reviews(baseline, raw_csv, chunksize=3)
+    load_staging_native(native, raw_csv, workers=workers, shard_rows=2)
+
+    expected = _staged(baseline)
+    assert len(expected) == 6
+    assert expected["content_fingerprint"].notna().all()
+    pd.testing.assert_frame_equal(_staged(native), expected)
+
+
+def test_native_loader_quarantines_failed_shard(fresh_db, tmp_path, monkeypatch):
+    csv_path = write_raw_csv(tmp_path / "reviews.csv", [
+        review_row(review_id=f"r{i}") for i in range(1, 6)
+    ])
+
+    original = bulk_load._executemany_shard
+
+    def executemany_shard(conn, df):
+        if "r3" in set(df["review_id"]):
+            raise sqlite3.OperationalError("simulated write failure")
+        return original(conn, df)
+
+    monkeypatch.setattr(bulk_load, "_executemany_shard", executemany_shard)
+
+    assert load_staging_native(fresh_db, csv_path, workers=1, shard_rows=2) == 3
+
+    with fresh_db.connect() as conn:
+        staged = conn.execute(
+            text("SELECT review_id FROM staging_reviews ORDER BY review_id")
+        ).scalars().all()
+        quarantined = conn.execute(
+            text("SELECT row_number, review_id, reason FROM quarantined_reviews ORDER BY row_number")
+        ).all()
+
+    assert staged == ["r1", "r2", "r5"]
+    assert quarantined == [
+        (3, "r3", "batch load failed: OperationalError: simulated write failure"),
+        (4, "r4", "batch load failed: OperationalError: simulated write failure"),
+    ]
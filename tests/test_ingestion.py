@@ -0,0 +1,264 @@
+import io
+
+import pandas as pd
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from app.db.ingest import ingest_reviews
+from app.db.sharding import shard_index
+from app.db.validation import validate_reviews
+from scripts import normalise_data
+from scripts.bulk_load import split_csv_shards
+from scripts.ingest_reviews import ingest_raw_reviews
+
+from factories import review_row, write_raw_csv
+
+
+def _write(path, text):
+    path.write_text(text, encoding="utf-8", newline="")
+    return str(path)
+
+
+def test_split_csv_shards_keeps_multiline_records_whole(tmp_path):
+    csv_path = _write(
+        tmp_path / "reviews.csv",
+        'id,content\n'
+        '1,"first line\nsecond line"\n'
+        '2,plain\n'
+        '3,"a ""quoted"" word\nover\nthree lines"\n'
+        '4,plain\n'
+        '5,"last\nrecord"\n',
+    )
+
+    shards = list(split_csv_shards(csv_path, shard_rows=2))
+
+    assert [first_row for _, _, first_row in shards] == [0, 2, 4]
+
+    frames = [pd.read_csv(io.StringIO(header + body), dtype=str)
+              for header, body, _ in shards]
+    assert [len(f) for f in frames] == [2, 2, 1]
+
+    combined = pd.concat(frames, ignore_index=True)
+    assert combined["id"].tolist() == ["1", "2", "3", "4", "5"]
+    assert combined.loc[2, "content"] == 'a "quoted" word\nover\nthree lines'
+
+
+# ---------------------------------------------------------------------------
+# Validation
+# ---------------------------------------------------------------------------
+def _reasons(*rows):
+    clean, rejected = validate_reviews(pd.DataFrame(list(rows)))
+    return len(clean), rejected["reason"].tolist()
+
+
+def test_validate_reviews_accepts_mixed_iso_dates():
+    # A timezone-qualified timestamp first must not make plain dates fail
+    clean, reasons = _reasons(
+        review_row(review_date="2024-10-17T10:00:00+05:00"),
+        review_row(review_date="2024-10-18"),
+        review_row(review_date="2024-10-19"),
+    )
+    assert (clean, reasons) == (3, [])
+
+
+def test_validate_reviews_rejects_bad_dates():
+    assert _reasons(review_row(review_date="not a date")) == (0, ["invalid review_date"])
+    assert _reasons(review_row(review_date="2024-02-30")) == (0, ["invalid review_date"])
+
+
+@pytest.mark.parametrize("rating", ["abc", "7", "0", "4.5", ""])
+def test_validate_reviews_rejects_bad_ratings(rating):
+    clean, reasons = _reasons(review_row(rating=rating))
+    assert clean == 0
+    assert "invalid rating" in reasons[0]
+
+
+@pytest.mark.parametrize("rating", ["1", "5", "3.0"])
+def test_validate_reviews_accepts_whole_ratings(rating):
+    assert _reasons(review_row(rating=rating)) == (1, [])
+
+
+@pytest.mark.parametrize("ip", ["10.0.0.1", "::1", "2001:db8::8a2e:370:7334", "::ffff:10.0.0.1"])
+def test_validate_reviews_accepts_ip_addresses(ip):
+    assert _reasons(review_row(review_ip_address=ip)) == (1, [])
+
+
+@pytest.mark.parametrize("ip", ["999.1.1.1", "1:2:3", "10.0.0", "localhost"])
+def test_validate_reviews_rejects_bad_ip_addresses(ip):
+    assert _reasons(review_row(review_ip_address=ip)) == (0, ["invalid review_ip_address"])
+
+
+def test_validate_reviews_reports_every_blank_field():
+    clean, reasons = _reasons(review_row(review_id=None, business_id="  "))
+    assert clean == 0
+    assert reasons == ["missing review_id; missing business_id"]
+
+
+# ---------------------------------------------------------------------------
+# Batched loads
+# ---------------------------------------------------------------------------
+def _count(engine, query):
+    with engine.connect() as conn:
+        return conn.execute(text(query)).scalar()
+
+
+def _quarantine_reasons(engine):
+    with engine.connect() as conn:
+        return conn.execute(
+            text("SELECT row_number, reason FROM quarantined_reviews ORDER BY row_number")
+        ).all()
+
+
+def _loaded_reviews(engine):
+    with engine.connect() as conn:
+        return conn.execute(
+            text("SELECT COALESCE(SUM(review_count), 0) FROM rollup_country_month")
+        ).scalar()
+
+
+def test_ingest_quarantines_conflicting_duplicate_review_id(fresh_db, tmp_path):
+    csv_path = write_raw_csv(tmp_path / "dup.csv", [
+        review_row(review_id="r1"),
+        review_row(review_id="r2"),
+        review_row(review_id="r1", content="Edited later"),
+    ])
+
+    ingest_reviews(csv_path, chunksize=2)
+
+    assert _loaded_reviews(fresh_db) == 2
+    assert _quarantine_reasons(fresh_db) == [(3, "duplicate review_id with different content")]
+
+
+def test_ingest_commits_batches_independently(fresh_db, tmp_path, monkeypatch):
+    csv_path = write_raw_csv(tmp_path / "reviews.csv", [
+        review_row(review_id="r1"),
+        review_row(review_id="r2"),
+        review_row(review_id="r3"),
+        review_row(review_id="r4", rating="9"),
+        review_row(review_id="r5"),
+    ])
+
+    # The second batch (rows 3-4) fails inside DataFrame.to_sql
+    original = normalise_data.write_reviews
+
+    def write_reviews(conn, reviews):
+        if "r3" in set(reviews["review_id"]):
+            raise pd.errors.DatabaseError("simulated write failure")
+        return original(conn, reviews)
+
+    monkeypatch.setattr(normalise_data, "write_reviews", write_reviews)
+
+    ingest_reviews(csv_path, chunksize=2)
+
+    assert _loaded_reviews(fresh_db) == 3
+    assert _quarantine_reasons(fresh_db) == [
+        (3, "batch load failed: DatabaseError: simulated write failure"),
+        (4, "invalid rating"),
+    ]
+
+
+def test_normalise_commits_chunks_independently(fresh_db, tmp_path, monkeypatch):
+    csv_path = write_raw_csv(tmp_path / "reviews.csv", [
+        review_row(review_id=f"r{i}") for i in range(1, 7)
+    ])
+    ingest_raw_reviews(fresh_db, csv_path)
+
+    # Staged before validation existed: not a valid rating
+    with fresh_db.begin() as conn:
+        conn.execute(text("UPDATE staging_reviews SET rating = 9 WHERE review_id = 'r6'"))
+
+    original = normalise_data.write_reviews
+
+    def write_reviews(conn, reviews):
+        if "r3" in set(reviews["review_id"]):
+            raise pd.errors.DatabaseError("simulated write failure")
+        return original(conn, reviews)
+
+    monkeypatch.setattr(normalise_data, "write_reviews", write_reviews)
+
+    normalise_data.normalise_reviews(fresh_db, chunksize=2)
+
+    # Chunk r3-r4 is rolled back and quarantined, the others are kept
+    assert _loaded_reviews(fresh_db) == 3
+    assert _count(fresh_db, "SELECT COUNT(*) FROM businesses") == 1
+    assert _quarantine_reasons(fresh_db) == [
+        (3, "batch load failed: DatabaseError: simulated write failure"),
+        (4, "batch load failed: DatabaseError: simulated write failure"),
+        (6, "invalid rating"),
+    ]
+
+
+def _staged_ids(engine):
+    with engine.connect() as conn:
+        return conn.execute(
+            text("SELECT review_id FROM staging_reviews ORDER BY review_id")
+        ).scalars().all()
+
+
+def test_staging_ingest_quarantines_failed_chunk(fresh_db, tmp_path, monkeypatch):
+    csv_path = write_raw_csv(tmp_path / "reviews.csv", [
+        review_row(review_id="r1"),
+        review_row(review_id="r2"),
+        review_row(review_id="r3"),
+        review_row(review_id="r4", rating="9"),
+        review_row(review_id="r5"),
+    ])
+
+    original = pd.DataFrame.to_sql
+
+    def to_sql(frame, name, *args, **kwargs):
+        if name == "staging_reviews" and "r3" in set(frame["review_id"]):
+            raise pd.errors.DatabaseError("simulated write failure")
+        return original(frame, name, *args, **kwargs)
+
+    monkeypatch.setattr(pd.DataFrame, "to_sql", to_sql)
+
+    ingest_raw_reviews(fresh_db, csv_path, chunksize=2)
+
+    assert _staged_ids(fresh_db) == ["r1", "r2", "r5"]
+    assert _quarantine_reasons(fresh_db) == [
+        (3, "batch load failed: DatabaseError: simulated write failure"),
+        (4, "invalid rating"),
+    ]
+
+
+def test_normalise_quarantines_only_rows_of_shards_that_did_not_commit(
+    fresh_db, two_shards, tmp_path, monkeypatch
+):
+    b0, b1 = (
+        next(f"b{i}" for i in range(1000) if shard_index(f"b{i}") == shard)
+        for shard in (0, 1)
+    )
+    csv_path = write_raw_csv(tmp_path / "reviews.csv", [
+        review_row(review_id="r1", business_id=b0),
+        review_row(review_id="r2", business_id=b1),
+        review_row(review_id="r3", business_id=b0),
+    ])
+    ingest_raw_reviews(fresh_db, csv_path)
+
+    # The second shard's first commit fails, after the first shard committed
+    failures = [OperationalError("COMMIT", {}, Exception("simulated commit failure"))]
+    real_connect = two_shards[1].connect
+
+    def connect():
+        conn = real_connect()
+        real_commit = conn.commit
+
+        def commit():
+            if failures:
+                raise failures.pop()
+            real_commit()
+
+        conn.commit = commit
+        return conn
+
+    monkeypatch.setattr(two_shards[1], "connect", connect)
+
+    normalise_data.normalise_reviews(fresh_db)
+
+    assert [_loaded_reviews(shard) for shard in two_shards] == [2, 0]
+    # Only r2, routed to the shard that did not commit, is quarantined
+    reasons = _quarantine_reasons(fresh_db)
+    assert [row for row, _ in reasons] == [2]
+    assert reasons[0][1].startswith("batch load failed: OperationalError")
@@ -0,0 +1,94 @@
+import pandas as pd
+from sqlalchemy import func, select, text
+
+from app.db.fingerprint import content_fingerprints
+from app.db.ingest import ingest_reviews
+from app.db.partitions import review_source
+from app.db.validation import parse_review_dates
+from scripts.ingest_reviews import ingest_raw_reviews
+from scripts.normalise_data import ensure_review_fingerprints, normalise_reviews
+
+from factories import review_row, write_raw_csv
+
+
+def _reviews(engine):
+    with engine.connect() as conn:
+        source = review_source(conn)
+        return conn.execute(
+            select(source.c.review_id, source.c.content_fingerprint).order_by(source.c.review_id)
+        ).all()
+
+
+def _review_count(engine):
+    with engine.connect() as conn:
+        return conn.execute(select(func.count()).select_from(review_source(conn))).scalar()
+
+
+def test_duplicates_from_an_earlier_run_are_dropped(fresh_db, tmp_path):
+    first = write_raw_csv(tmp_path / "first.csv", [
+        review_row(review_id="r1"),
+        review_row(review_id="r2", review_date="2024-11-02"),
+    ])
+    second = write_raw_csv(tmp_path / "second.csv", [
+        review_row(review_id="r2", review_date="2024-11-02"),
+        review_row(review_id="r3"),
+        review_row(review_id="r1"),
+    ])
+
+    ingest_reviews(first)
+    ingest_reviews(second)
+
+    assert [r.review_id for r in _reviews(fresh_db)] == ["r1", "r2", "r3"]
+
+
+def test_staged_rows_without_fingerprint_are_fingerprinted_on_read(fresh_db, tmp_path):
+    csv_path = write_raw_csv(tmp_path / "reviews.csv", [
+        review_row(review_id="r1"),
+        review_row(review_id="r2", content="Other"),
+    ])
+    # The same file staged twice, before fingerprints existed
+    ingest_raw_reviews(fresh_db, csv_path)
+    ingest_raw_reviews(fresh_db, csv_path)
+    with fresh_db.begin() as conn:
+        conn.execute(text("UPDATE staging_reviews SET content_fingerprint = NULL"))
+
+    normalise_reviews(fresh_db)
+
+    reviews = _reviews(fresh_db)
+    assert [r.review_id for r in reviews] == ["r1", "r2"]
+
+    staged = pd.read_sql("SELECT * FROM staging_reviews", fresh_db).drop_duplicates("review_id")
+    expected = dict(zip(staged["review_id"], content_fingerprints(staged)))
+    assert {r.review_id: r.content_fingerprint for r in reviews} == expected
+
+
+def test_reviews_table_from_before_fingerprints_is_migrated(fresh_db, tmp_path):
+    # The original layout: flat reviews table without content_fingerprint
+    with fresh_db.begin() as conn:
+        conn.execute(text("DROP TABLE reviews"))
+        conn.execute(text(
+            "CREATE TABLE reviews (review_id VARCHAR PRIMARY KEY, reviewer_id VARCHAR, "
+            "business_id VARCHAR, review_title VARCHAR, content VARCHAR, rating INTEGER, "
+            "review_date DATETIME, review_ip_address VARCHAR)"
+        ))
+        conn.execute(text(
+            "INSERT INTO users VALUES ('u1', 'Ada', 'ada@example.com', 'UK')"
+        ))
+        conn.execute(text("INSERT INTO businesses VALUES ('b1', 'Acme')"))
+        conn.execute(text(
+            "INSERT INTO reviews VALUES ('r1', 'u1', 'b1', 'Fine', 'Worked as expected', "
+            "4, '2024-10-17', '192.168.0.1')"
+        ))
+
+    ensure_review_fingerprints(fresh_db)
+
+    row = review_row(review_id="r1")
+    expected = content_fingerprints(pd.DataFrame([{
+        **row,
+        "review_date": parse_review_dates(pd.Series([row["review_date"]])).dt.date[0],
+    }]))[0]
+    assert _reviews(fresh_db)[0].content_fingerprint == expected
+
+    # Reloading the file that produced the legacy row adds nothing
+    ingest_reviews(write_raw_csv(tmp_path / "reviews.csv", [row]))
+    assert _review_count(fresh_db) == 1
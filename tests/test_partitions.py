@@ -0,0 +1,106 @@
+from datetime import datetime
+
+import pandas as pd
+from sqlalchemy import select, text
+
+from app.db.partitions import (
+    drop_partition,
+    list_partitions,
+    partition_name,
+    review_source,
+    write_reviews,
+)
+from app.db.validation import quarantine
+from scripts.ingest_reviews import ingest_raw_reviews, staging
+from scripts.normalise_data import normalise_reviews
+from scripts.purge_month import purge_month
+
+from factories import review_row, write_raw_csv
+
+
+def _reviews(*dates):
+    return pd.DataFrame([
+        {
+            "review_id": f"r{i}",
+            "reviewer_id": "u1",
+            "business_id": "b1",
+            "review_title": "Great",
+            "content": "Great service",
+            "rating": 4,
+            "review_date": review_date,
+            "review_ip_address": "192.168.0.1",
+        }
+        for i, review_date in enumerate(dates, start=1)
+    ])
+
+
+def _review_ids(conn, start=None, end=None):
+    source = review_source(conn, start, end)
+    return sorted(conn.execute(select(source.c.review_id)).scalars())
+
+
+def _table_ids(conn, table):
+    return sorted(conn.execute(text(f"SELECT review_id FROM {table}")).scalars())
+
+
+def test_write_reviews_splits_rows_by_month(fresh_db):
+    with fresh_db.begin() as conn:
+        write_reviews(conn, _reviews("2024-09-30", "2024-10-01", "2024-10-31", "2024-11-01"))
+
+        assert list_partitions(conn) == ["2024-09", "2024-10", "2024-11"]
+        assert _table_ids(conn, partition_name("2024-09")) == ["r1"]
+        assert _table_ids(conn, partition_name("2024-10")) == ["r2", "r3"]
+        assert _table_ids(conn, partition_name("2024-11")) == ["r4"]
+
+
+def test_review_source_selects_overlapping_months(fresh_db):
+    with fresh_db.begin() as conn:
+        write_reviews(conn, _reviews("2024-09-30", "2024-10-15", "2024-11-01"))
+
+        # Month tables outside the range are not read at all
+        assert _review_ids(conn, datetime(2024, 10, 1), datetime(2024, 10, 31)) == ["r2"]
+        assert _review_ids(conn, start=datetime(2024, 10, 20)) == ["r2", "r3"]
+        assert _review_ids(conn, end=datetime(2024, 10, 1)) == ["r1", "r2"]
+        assert _review_ids(conn) == ["r1", "r2", "r3"]
+        assert _review_ids(conn, datetime(2025, 1, 1), datetime(2025, 2, 1)) == []
+
+
+def test_flat_reviews_move_into_month_tables(fresh_db):
+    with fresh_db.begin() as conn:
+        # Rows loaded before partitioning live in the flat reviews table
+        _reviews("2024-10-17", "2024-11-02").to_sql("reviews", conn, if_exists="append", index=False)
+        assert _review_ids(conn) == ["r1", "r2"]
+
+        write_reviews(conn, _reviews("2024-12-05").assign(review_id="r3"))
+
+        assert _table_ids(conn, "reviews") == []
+        assert _table_ids(conn, partition_name("2024-10")) == ["r1"]
+        assert _review_ids(conn) == ["r1", "r2", "r3"]
+
+
+def test_drop_partition_removes_only_that_month(fresh_db):
+    with fresh_db.begin() as conn:
+        write_reviews(conn, _reviews("2024-10-17", "2024-11-02"))
+
+        drop_partition(conn, "2024-10")
+
+        assert list_partitions(conn) == ["2024-11"]
+        assert _review_ids(conn) == ["r2"]
+
+
+def test_purge_month_removes_reviews_and_source_rows(fresh_db, tmp_path):
+    csv_path = str(tmp_path / "reviews.csv")
+    write_raw_csv(csv_path, [
+        review_row(review_id="r1", review_date="2024-10-17"),
+        review_row(review_id="r2", review_date="2024-11-02"),
+        review_row(review_id="r3", review_date="2024-10-18", rating="9"),
+    ])
+    ingest_raw_reviews(fresh_db, csv_path)
+    normalise_reviews(fresh_db)
+
+    purge_month("2024-10")
+
+    with fresh_db.connect() as conn:
+        assert _review_ids(conn) == ["r2"]
+        assert _table_ids(conn, staging.name) == ["r2"]
+        assert _table_ids(conn, quarantine.name) == []
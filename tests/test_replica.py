@@ -0,0 +1,123 @@
+import os
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from app.db import replica
+from app.db.replica import ReadRouter, publish_snapshot, snapshot_path
+
+
+@pytest.fixture
+def primary(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'primary.db'}")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE t (x INTEGER)"))
+        conn.execute(text("INSERT INTO t VALUES (1)"))
+    return engine
+
+
+def _count(engine):
+    with engine.connect() as conn:
+        return conn.execute(text("SELECT COUNT(*) FROM t")).scalar()
+
+
+def test_reads_use_primary_until_a_snapshot_is_published(primary):
+    router = ReadRouter(primary)
+    assert router.engine() is primary
+
+    path = publish_snapshot(primary)
+    assert path == snapshot_path(primary)
+    assert path.endswith("primary.snapshot.db")
+
+    snapshot = router.engine()
+    assert snapshot is not primary
+    assert _count(snapshot) == 1
+
+    # Read-only: writes to the snapshot are refused
+    with pytest.raises(OperationalError):
+        with snapshot.begin() as conn:
+            conn.execute(text("INSERT INTO t VALUES (2)"))
+
+
+def test_snapshot_reflects_last_publish_only(primary):
+    router = ReadRouter(primary)
+    publish_snapshot(primary)
+
+    with primary.begin() as conn:
+        conn.execute(text("INSERT INTO t VALUES (2)"))
+    assert _count(router.engine()) == 1
+
+    publish_snapshot(primary)
+    assert _count(router.engine()) == 2
+
+
+def test_snapshot_is_swapped_in_with_an_atomic_rename(primary, monkeypatch):
+    publish_snapshot(primary)
+    with primary.begin() as conn:
+        conn.execute(text("INSERT INTO t VALUES (2)"))
+
+    router = ReadRouter(primary)
+    calls = []
+    real_replace = os.replace
+
+    def replace(src, dst):
+        # The new copy is complete, readers still see the old snapshot
+        calls.append((src, dst))
+        assert _count(create_engine(f"sqlite:///{src}")) == 2
+        assert _count(router.engine()) == 1
+        real_replace(src, dst)
+
+    monkeypatch.setattr(replica.os, "replace", replace)
+    path = publish_snapshot(primary)
+
+    assert calls == [(f"{path}.tmp", path)]
+    assert not os.path.exists(f"{path}.tmp")
+    assert _count(router.engine()) == 2
+
+
+def _postgres_replica(lag=None, error=None):
+    """Stand-in for a PostgreSQL replica engine reporting `lag` seconds."""
+
+    @contextmanager
+    def connect():
+        if error:
+            raise error
+        yield SimpleNamespace(execute=lambda _: SimpleNamespace(scalar=lambda: lag))
+
+    return SimpleNamespace(dialect=SimpleNamespace(name="postgresql"), connect=connect)
+
+
+def _router(primary, replica_engine):
+    router = ReadRouter(primary, "postgresql://replica/trustpilot", max_lag_seconds=30)
+    router._replica = replica_engine
+    return router
+
+
+def test_replica_within_lag_serves_reads(primary):
+    replica_engine = _postgres_replica(lag=5)
+    assert _router(primary, replica_engine).engine() is replica_engine
+
+
+def test_lagging_replica_falls_back_to_primary(primary):
+    assert _router(primary, _postgres_replica(lag=120)).engine() is primary
+
+
+def test_unreachable_replica_falls_back_to_primary(primary):
+    error = OperationalError("SELECT 1", {}, Exception("connection refused"))
+    assert _router(primary, _postgres_replica(error=error)).engine() is primary
+
+
+def test_replica_lag_is_rechecked_after_interval(primary, monkeypatch):
+    replica_engine = _postgres_replica(lag=120)
+    router = _router(primary, replica_engine)
+    assert router.engine() is primary
+
+    # Caught up, but the cached measurement is still trusted
+    replica_engine.connect = _postgres_replica(lag=0).connect
+    assert router.engine() is primary
+
+    monkeypatch.setattr(replica, "LAG_CHECK_INTERVAL_SECONDS", 0.0)
+    assert router.engine() is replica_engine
@@ -0,0 +1,125 @@
+import pandas as pd
+from fastapi.testclient import TestClient
+from sqlalchemy import select, text
+
+from app.db.ingest import create_tables, ingest_reviews
+from app.db.models import BusinessMonthRollup, CountryMonthRollup, UserMonthRollup
+from app.db.partitions import drop_partition
+from app.db.rollups import apply_rollup_deltas, rebuild_rollups
+from app.main import app
+
+from factories import review_row, write_raw_csv
+
+client = TestClient(app)
+
+
+def _batch(*rows):
+    return pd.DataFrame([
+        {
+            "business_id": "b1",
+            "reviewer_id": "u1",
+            "reviewer_country": "UK",
+            "rating": 4,
+            "review_date": "2024-10-17",
+            **row,
+        }
+        for row in rows
+    ])
+
+
+def _country_counts(conn):
+    rows = conn.execute(
+        select(CountryMonthRollup.reviewer_country, CountryMonthRollup.month,
+               CountryMonthRollup.rating, CountryMonthRollup.review_count)
+    ).all()
+    return {(country, month, rating): count for country, month, rating, count in rows}
+
+
+def _rollup_rows(conn):
+    return {
+        model.__tablename__: sorted(tuple(row) for row in conn.execute(select(model.__table__)).all())
+        for model in (BusinessMonthRollup, CountryMonthRollup, UserMonthRollup)
+    }
+
+
+def _ingest(tmp_path, rows):
+    csv_path = str(tmp_path / "reviews.csv")
+    write_raw_csv(csv_path, rows)
+    ingest_reviews(csv_path)
+
+
+def test_rollup_upserts_add_up_across_batches(fresh_db):
+    with fresh_db.begin() as conn:
+        apply_rollup_deltas(conn, _batch({}, {"rating": 5}))
+        apply_rollup_deltas(conn, _batch({}, {}, {"review_date": "2024-11-02"}))
+
+        assert _country_counts(conn) == {
+            ("UK", "2024-10", 4): 3,
+            ("UK", "2024-10", 5): 1,
+            ("UK", "2024-11", 4): 1,
+        }
+        users = conn.execute(
+            select(UserMonthRollup.month, UserMonthRollup.review_count)
+            .where(UserMonthRollup.reviewer_id == "u1", UserMonthRollup.rating == 4)
+        ).all()
+        assert sorted(users) == [("2024-10", 3), ("2024-11", 1)]
+
+
+def test_drop_partition_removes_only_that_months_rollups(fresh_db, tmp_path):
+    _ingest(tmp_path, [
+        review_row(review_id="r1", review_date="2024-10-17"),
+        review_row(review_id="r2", review_date="2024-11-02"),
+    ])
+
+    with fresh_db.begin() as conn:
+        drop_partition(conn, "2024-10")
+        assert _country_counts(conn) == {("UK", "2024-11", 4): 1}
+
+
+def test_aggregates_match_review_listing_for_whole_months(fresh_db, tmp_path):
+    _ingest(tmp_path, [
+        review_row(review_id="r1", review_date="2024-09-30"),
+        review_row(review_id="r2", review_date="2024-10-01", rating="5"),
+        review_row(review_id="r3", review_date="2024-10-17", reviewer_id="u2",
+                   reviewer_country="France"),
+        review_row(review_id="r4", review_date="2024-10-31"),
+        review_row(review_id="r5", review_date="2024-11-01"),
+    ])
+    params = {"start_date": "2024-10-01", "end_date": "2024-10-31"}
+
+    listing = client.get("/reviews/", params=params)
+    aggregates = client.get("/reports/aggregates", params={**params, "group_by": "country"})
+
+    assert listing.status_code == aggregates.status_code == 200
+    counts = pd.read_csv(pd.io.common.StringIO(aggregates.text))
+    assert int(listing.headers["X-Total-Count"]) == counts["review_count"].sum() == 3
+
+
+def test_rebuild_rollups_matches_incremental_counts(fresh_db, tmp_path):
+    _ingest(tmp_path, [
+        review_row(review_id="r1", review_date="2024-10-17"),
+        review_row(review_id="r2", review_date="2024-10-18", rating="2"),
+        review_row(review_id="r3", review_date="2024-11-02", reviewer_id="u2",
+                   reviewer_country="France"),
+    ])
+
+    with fresh_db.begin() as conn:
+        incremental = _rollup_rows(conn)
+        assert rebuild_rollups(conn) == 3
+        assert _rollup_rows(conn) == incremental
+
+
+def test_create_tables_fills_rollups_added_to_existing_database(fresh_db, tmp_path):
+    _ingest(tmp_path, [
+        review_row(review_id="r1", review_date="2024-10-17"),
+        review_row(review_id="r2", review_date="2024-11-02"),
+    ])
+    with fresh_db.begin() as conn:
+        expected = _rollup_rows(conn)
+        for model in (BusinessMonthRollup, CountryMonthRollup, UserMonthRollup):
+            conn.execute(text(f"DROP TABLE {model.__tablename__}"))
+
+    create_tables()
+
+    with fresh_db.connect() as conn:
+        assert _rollup_rows(conn) == expected